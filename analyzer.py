@@ -11,6 +11,7 @@ try:
     import busio
     import adafruit_ads1x15.ads1115 as ADS
     from adafruit_ads1x15.analog_in import AnalogIn
+    from adafruit_ads1x15.ads1x15 import Mode
     MOCK_MODE = False
 except ImportError:
     print("Running in mock mode for Windows development...")
@@ -19,19 +20,549 @@ except ImportError:
     AnalogIn = MockADS1115.AnalogIn
     board = MockADS1115.board
     busio = MockADS1115.busio
+    Mode = MockADS1115.Mode
     MOCK_MODE = True
 
+# SPI is only needed for the hardware DDS loader
+try:
+    import spidev
+except ImportError:
+    spidev = None
+if MOCK_MODE:
+    from mock_hardware import MockSpiDevModule as spidev
+
 import time
+import bisect
+import queue
+import threading
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-import tkinter as tk
-from tkinter import ttk, messagebox
 from datetime import datetime
 import json
 import os
-import random
+
+# The desktop GUI needs Tk; the web UI imports this module without it
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+except ImportError:
+    tk = ttk = messagebox = FigureCanvasTkAgg = None
+
+
+class HardwareBackend:
+    """The hardware modules the analyzer drives (real ones or the mocks)"""
+
+    def __init__(self, GPIO, ADS, AnalogIn, board, busio, Mode, spidev, simulates_antenna=False):
+        self.GPIO = GPIO
+        self.ADS = ADS
+        self.AnalogIn = AnalogIn
+        self.board = board
+        self.busio = busio
+        self.Mode = Mode
+        self.spidev = spidev
+        self.stats = None
+        self.clock = time
+        # The plain mocks read noise, so sweeps substitute the demo antenna
+        self.simulates_antenna = simulates_antenna
+
+
+def create_backend(mock_backend='verbose', dds_pins=(12, 16, 20)):
+    """Backend for this platform
+
+    In mock mode 'silent' selects the instrumented mock that counts bus
+    activity instead of printing, and 'simulated' runs that mock on a
+    virtual clock with DDS settling modelled.
+    """
+    if mock_backend not in ('verbose', 'silent', 'simulated'):
+        raise ValueError(f"Unknown mock backend '{mock_backend}'")
+    if MOCK_MODE and mock_backend == 'silent':
+        from mock_hardware import InstrumentedBackend
+        return InstrumentedBackend()
+    if MOCK_MODE and mock_backend == 'simulated':
+        from mock_hardware import SimulatedBackend
+        return SimulatedBackend(*dds_pins)
+    return HardwareBackend(GPIO, ADS, AnalogIn, board, busio, Mode, spidev, simulates_antenna=MOCK_MODE)
+
+
+# ADS1115 data rates (samples/s); higher rates convert faster but are noisier
+ADS1115_DATA_RATES = (8, 16, 32, 64, 128, 250, 475, 860)
+ADS1115_DEFAULT_RATE = 128
+
+# AD9850 reference clock and serial frame layout
+DDS_CLOCK_HZ = 125000000.0
+DDS_FRAME_BYTES = 5   # 32-bit tuning word followed by the control/phase byte
+
+
+def dds_tuning_words(frequencies, clock_hz=DDS_CLOCK_HZ):
+    """Vectorized AD9850 tuning words for an array of frequencies"""
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    return np.floor((frequencies * 4294967296.0) / clock_hz).astype(np.uint32)
+
+
+def dds_frames(words):
+    """Serialize tuning words into 5-byte frames in the order they are shifted out"""
+    words = np.asarray(words, dtype=np.uint32).reshape(-1)
+    frames = np.zeros((len(words), DDS_FRAME_BYTES), dtype=np.uint8)
+    frames[:, :4] = words.astype('>u4').view(np.uint8).reshape(-1, 4)
+    return frames
+
+
+def grid_weights(frequencies):
+    """Bandwidth each point stands for on a non-uniform grid, or None if uniform"""
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    if len(frequencies) < 3:
+        return None
+    order = np.argsort(frequencies)
+    ordered = frequencies[order]
+    steps = np.diff(ordered)
+    if np.allclose(steps, steps[0], rtol=1e-6, atol=0):
+        return None
+    mids = (ordered[1:] + ordered[:-1]) / 2
+    lower = np.concatenate(([ordered[0] - steps[0] / 2], mids))
+    upper = np.concatenate((mids, [ordered[-1] + steps[-1] / 2]))
+    weights = np.empty_like(frequencies)
+    weights[order] = upper - lower
+    return weights
+
+
+# Detector calibration: magnitude voltage = offset + slope * return loss (dB)
+MAG_OFFSET_V = 0.9
+MAG_SLOPE_V_PER_DB = 0.03
+
+
+def voltages_to_swr(mag_voltages, offset=MAG_OFFSET_V, slope=MAG_SLOPE_V_PER_DB, max_reflection=0.99, max_swr=50.0):
+    """Vectorized magnitude voltage -> dB -> reflection coefficient -> SWR"""
+    mag_db = (np.asarray(mag_voltages, dtype=np.float64) - offset) / slope
+    reflection_coeff = np.minimum(10 ** (mag_db / 20.0), max_reflection)
+    return np.minimum((1 + reflection_coeff) / (1 - reflection_coeff), max_swr)
+
+
+def simulate_antenna_swr(frequencies, rng=None, resonant_freq=14.2e6, bandwidth=2.0e6):
+    """Demo dipole SWR for a whole array of frequencies (any shape) at once"""
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    if rng is None:
+        rng = np.random.default_rng()
+    normalized_offset = np.abs(frequencies - resonant_freq) / bandwidth
+    base_swr = 1.1 + 2.0 * (normalized_offset ** 2)
+    harmonic_effect = 0.3 * np.sin(frequencies / 1e6 * 0.5)
+    random_variation = rng.uniform(-0.1, 0.1, frequencies.shape)
+    return np.clip(base_swr + harmonic_effect + random_variation, 1.0, 10.0)
+
+
+def simulated_mag_voltage(swr):
+    """Detector voltage the demo antenna's SWR would produce"""
+    reflection_coeff = (swr - 1) / (swr + 1)
+    mag_db = 20 * np.log10(reflection_coeff + 0.01)
+    return np.clip(0.9 + mag_db * 0.03, 0.5, 2.5)
+
+
+def robust_average(samples, method='median', reject_outliers=False, trim=0.2):
+    """Combine repeated ADC samples: 'median', 'trimmed' mean or plain 'mean'
+
+    With reject_outliers, samples further than 3.5 robust sigmas (MAD) from
+    the median are dropped first.
+    """
+    samples = np.asarray(samples, dtype=np.float64)
+    if reject_outliers and len(samples) > 3:
+        median = np.median(samples)
+        mad = np.median(np.abs(samples - median))
+        if mad > 0:
+            samples = samples[np.abs(samples - median) <= 3.5 * 1.4826 * mad]
+    if method == 'median':
+        return float(np.median(samples))
+    if method == 'trimmed':
+        cut = int(len(samples) * trim)
+        samples = np.sort(samples)[cut:len(samples) - cut]
+    return float(samples.mean())
+
+
+# Rating bands: excellent (<=1.5), good (<=2.0), acceptable (<=3.0), poor
+SWR_THRESHOLDS = (1.5, 2.0, 3.0)
+GRADE_CUTOFFS = np.array([40, 50, 55, 60, 65, 70, 75, 80, 85, 90])
+GRADES = np.array(["F", "D", "C-", "C", "C+", "B-", "B", "B+", "A-", "A", "A+"])
+
+
+def rating_score(excellent_ratio, good_ratio, acceptable_ratio, min_swr):
+    """Score (0-100) from the band ratios and best SWR; works element-wise on arrays"""
+    excellent_ratio, good_ratio, acceptable_ratio, min_swr = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (excellent_ratio, good_ratio, acceptable_ratio, min_swr)))
+    score = np.select(
+        [excellent_ratio >= 0.8, good_ratio >= 0.6, acceptable_ratio >= 0.4],
+        [90 + (excellent_ratio - 0.8) * 50, 70 + (good_ratio - 0.6) * 50, 50 + (acceptable_ratio - 0.4) * 50],
+        acceptable_ratio * 125)
+    score = score + np.select([min_swr <= 1.2, min_swr <= 1.5], [5, 2], 0)
+    score = score + np.where(good_ratio >= 0.7, 3, 0)
+    return np.clip(score, 0, 100)
+
+
+def rating_grade(score):
+    """Letter grade(s) for score(s)"""
+    return GRADES[np.searchsorted(GRADE_CUTOFFS, score, side='right')]
+
+
+def rate_swr(swr, weights=None, unmeasured=0):
+    """Rate one sweep (1-D) or a stack of equal-length sweeps (2-D, one per row)
+
+    Every point is binned into its rating band with a single searchsorted and
+    the band totals of all rows come from one bincount. weights (per point,
+    broadcast against swr) make the ratios fractions of bandwidth. unmeasured
+    planned points (e.g. skipped by an early stop) count as poor, each with
+    the mean point weight. Returns a dict of arrays with one entry per sweep.
+    """
+    swr = np.atleast_2d(np.asarray(swr, dtype=np.float64))
+    rows, points = swr.shape
+    bands = len(SWR_THRESHOLDS) + 1
+    band = np.searchsorted(SWR_THRESHOLDS, swr, side='left') + bands * np.arange(rows)[:, None]
+    counts = np.bincount(band.ravel(), minlength=rows * bands).reshape(rows, bands)
+    counts[:, -1] += unmeasured
+    if weights is None:
+        totals = counts
+        avg_swr = swr.mean(axis=1)
+    else:
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), swr.shape)
+        totals = np.bincount(band.ravel(), weights=weights.ravel(), minlength=rows * bands).reshape(rows, bands)
+        totals[:, -1] += unmeasured * weights.mean(axis=1)
+        avg_swr = np.average(swr, axis=1, weights=weights)
+
+    within = np.cumsum(counts, axis=1)[:, :-1]
+    ratios = np.cumsum(totals, axis=1)[:, :-1] / totals.sum(axis=1, keepdims=True)
+    min_swr = swr.min(axis=1)
+    score = rating_score(ratios[:, 0], ratios[:, 1], ratios[:, 2], min_swr)
+    return {
+        "rating": rating_grade(score),
+        "score": score,
+        "min_swr": min_swr,
+        "avg_swr": avg_swr,
+        "max_swr": swr.max(axis=1),
+        "excellent_points": within[:, 0],
+        "good_points": within[:, 1],
+        "acceptable_points": within[:, 2],
+        "total_points": np.full(rows, points + unmeasured),
+        "excellent_ratio": ratios[:, 0],
+        "good_ratio": ratios[:, 1],
+        "acceptable_ratio": ratios[:, 2],
+    }
+
+
+class RunningRating:
+    """Provisional rating updated point by point while a sweep runs
+
+    Keeps running min/max/sum and per-band counts, so add() is O(1) and the
+    grade can be shown live. Ratios are fractions of the points seen so far.
+    """
+
+    def __init__(self, expected_points=None):
+        self.expected_points = expected_points
+        self.count = 0
+        self.min_swr = float('inf')
+        self.max_swr = float('-inf')
+        self.swr_sum = 0.0
+        self.band_counts = [0] * (len(SWR_THRESHOLDS) + 1)
+
+    def add(self, swr):
+        self.count += 1
+        self.min_swr = min(self.min_swr, swr)
+        self.max_swr = max(self.max_swr, swr)
+        self.swr_sum += swr
+        self.band_counts[bisect.bisect_left(SWR_THRESHOLDS, swr)] += 1
+
+    @property
+    def avg_swr(self):
+        return self.swr_sum / self.count if self.count else float('nan')
+
+    def ratios(self):
+        """(excellent, good, acceptable) fractions of the points seen so far"""
+        if not self.count:
+            return 0.0, 0.0, 0.0
+        excellent, good, acceptable, _ = self.band_counts
+        return (excellent / self.count, (excellent + good) / self.count,
+                (excellent + good + acceptable) / self.count)
+
+    @property
+    def score(self):
+        if not self.count:
+            return 0.0
+        return float(rating_score(*self.ratios(), self.min_swr))
+
+    @property
+    def rating(self):
+        return str(rating_grade(self.score)) if self.count else "F"
+
+    def as_dict(self):
+        excellent_ratio, good_ratio, acceptable_ratio = self.ratios()
+        return {
+            "rating": self.rating,
+            "score": self.score,
+            "points": self.count,
+            "expected_points": self.expected_points,
+            "min_swr": self.min_swr if self.count else None,
+            "avg_swr": self.avg_swr if self.count else None,
+            "max_swr": self.max_swr if self.count else None,
+            "excellent_ratio": excellent_ratio,
+            "good_ratio": good_ratio,
+            "acceptable_ratio": acceptable_ratio
+        }
+
+
+class GuaranteedFailStop:
+    """Stop once no way of filling the remaining points can reach min_score"""
+
+    def __init__(self, min_score=float(GRADE_CUTOFFS[0])):
+        self.min_score = min_score
+        self.total = 0
+
+    def reset(self, total):
+        self.total = total
+
+    def check(self, running, result, index):
+        remaining = self.total - running.count
+        excellent, good, acceptable, _ = running.band_counts
+        # The score is not monotone in the band counts: reaching the good
+        # branch can score below a fully acceptable band. Poor points never
+        # help, and within a branch more excellent/good points never hurt, so
+        # the best completion is all excellent, all good or all acceptable,
+        # the last two with one excellent point for the min SWR bonus.
+        extra_excellent = np.minimum([remaining, 0, 1, 0, 1], remaining)
+        extra_good = np.maximum([0, remaining, remaining - 1, 0, 0], 0)
+        best_score = rating_score((excellent + extra_excellent) / self.total,
+                                  (excellent + good + extra_excellent + extra_good) / self.total,
+                                  (excellent + good + acceptable + remaining) / self.total,
+                                  np.where(extra_excellent > 0, 1.0, running.min_swr)).max()
+        if best_score < self.min_score:
+            return "guaranteed_fail"
+        return None
+
+
+class BracketedResonanceStop:
+    """Stop once the SWR minimum is passed and the band stays above ceiling_swr
+
+    Assumes one resonance in the swept band: after the best point so far the
+    SWR has to exceed ceiling_swr for confirm_points consecutive points.
+    """
+
+    def __init__(self, ceiling_swr=3.0, confirm_points=5):
+        self.ceiling_swr = ceiling_swr
+        self.confirm_points = confirm_points
+        self.reset(0)
+
+    def reset(self, total):
+        self.best_swr = float('inf')
+        self.points_above = 0
+
+    def check(self, running, result, index):
+        swr = result.swr[index]
+        if swr < self.best_swr:
+            self.best_swr = swr
+            self.points_above = 0
+        elif swr > self.ceiling_swr:
+            self.points_above += 1
+        else:
+            self.points_above = 0
+        if self.best_swr < self.ceiling_swr and self.points_above >= self.confirm_points:
+            return "resonance_bracketed"
+        return None
+
+
+class CancelStop:
+    """Stop when cancel() is called, e.g. from a GUI or web request thread"""
+
+    def __init__(self):
+        self.event = threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    def reset(self, total):
+        pass
+
+    def check(self, running, result, index):
+        return "cancelled" if self.event.is_set() else None
+
+
+EARLY_STOP_POLICIES = {
+    'fail': GuaranteedFailStop,
+    'bracketed': BracketedResonanceStop,
+}
+
+
+class SweepPlan:
+    """Precomputed DDS words and serial frames for a whole sweep grid
+
+    Points that round to the same tuning word are measured only once; the
+    first requested frequency of each group is kept.
+    """
+
+    def __init__(self, frequencies, clock_hz=DDS_CLOCK_HZ):
+        requested = np.asarray(frequencies, dtype=np.float64).reshape(-1)
+        words = dds_tuning_words(requested, clock_hz)
+        _, first = np.unique(words, return_index=True)
+        keep = np.sort(first)
+        self.requested_points = len(requested)
+        self.frequencies = requested[keep]
+        self.words = words[keep]
+        self.frames = dds_frames(self.words)
+        self._payloads = {}
+
+    @classmethod
+    def linspace(cls, start_freq, stop_freq, points, clock_hz=DDS_CLOCK_HZ):
+        return cls(np.linspace(start_freq, stop_freq, points), clock_hz)
+
+    @property
+    def duplicates(self):
+        return self.requested_points - len(self.frequencies)
+
+    def __len__(self):
+        return len(self.frequencies)
+
+    def payloads(self, dds):
+        """Frames converted once into the format the given DDS driver loads"""
+        if dds.name not in self._payloads:
+            self._payloads[dds.name] = dds.prepare(self.frames)
+        return self._payloads[dds.name]
+
+
+class SweepResult:
+    """Sweep measurements stored as contiguous NumPy columns
+
+    Indexing or iterating yields the per-point dicts older code expects and
+    to_dicts() gives the JSON-ready list; analysis should use the arrays.
+    """
+    FIELDS = ('frequency', 'swr', 'mag_voltage', 'phase_voltage')
+
+    def __init__(self, frequency=(), swr=(), mag_voltage=(), phase_voltage=()):
+        self.frequency = np.ascontiguousarray(frequency, dtype=np.float64)
+        self.swr = np.ascontiguousarray(swr, dtype=np.float64)
+        self.mag_voltage = np.ascontiguousarray(mag_voltage, dtype=np.float64)
+        self.phase_voltage = np.ascontiguousarray(phase_voltage, dtype=np.float64)
+        self.truncated = False
+        self.stop_reason = None
+        self.planned_points = len(self.frequency)
+
+    @classmethod
+    def from_measurements(cls, measurements):
+        """Accept a SweepResult, a dict of columns or a list of measurement dicts (e.g. loaded JSON)"""
+        if isinstance(measurements, cls):
+            return measurements
+        if isinstance(measurements, dict):
+            return cls(*(measurements[field] for field in cls.FIELDS))
+        columns = [[m[field] for m in measurements] for field in cls.FIELDS]
+        return cls(*columns)
+
+    def __len__(self):
+        return len(self.frequency)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SweepResult(*(getattr(self, field)[index] for field in self.FIELDS))
+        return {field: float(getattr(self, field)[index]) for field in self.FIELDS}
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def to_columns(self, decimals=None):
+        """JSON-ready dict of column lists, optionally rounded per field"""
+        decimals = decimals or {}
+        return {field: (np.round(getattr(self, field), decimals[field]) if field in decimals
+                        else getattr(self, field)).tolist() for field in self.FIELDS}
+
+    def to_dicts(self):
+        columns = [getattr(self, field).tolist() for field in self.FIELDS]
+        return [dict(zip(self.FIELDS, values)) for values in zip(*columns)]
+
+    def truncate(self, points, reason, planned_points=None):
+        """First points of the sweep, flagged as stopped early for reason
+
+        planned_points (default: this sweep's length) is kept so the rating
+        can account for the points that were never measured.
+        """
+        result = self[:points]
+        result.truncated = True
+        result.stop_reason = reason
+        result.planned_points = len(self) if planned_points is None else planned_points
+        return result
+
+    def best_index(self):
+        """Index of the minimum-SWR point"""
+        return int(np.argmin(self.swr))
+
+
+class GpioDDS:
+    """AD9850 serial loader that bit-bangs DATA and W_CLK through RPi.GPIO"""
+    name = 'gpio'
+
+    def __init__(self, gpio, w_clk, fq_ud, data):
+        self.gpio = gpio
+        self.W_CLK = w_clk
+        self.FQ_UD = fq_ud
+        self.DATA = data
+
+    def prepare(self, frames):
+        # One bit per W_CLK pulse, MSB of each byte first
+        return np.unpackbits(np.asarray(frames, dtype=np.uint8).reshape(-1, DDS_FRAME_BYTES), axis=1).tolist()
+
+    def load(self, bits):
+        self.shift(bits)
+        self.latch()
+
+    def shift(self, bits):
+        # Fills the input register only; the output changes on latch()
+        output, high, low = self.gpio.output, self.gpio.HIGH, self.gpio.LOW
+        for bit in bits:
+            output(self.DATA, bit)
+            output(self.W_CLK, high)
+            output(self.W_CLK, low)
+
+    def latch(self):
+        self.gpio.output(self.FQ_UD, self.gpio.HIGH)
+        self.gpio.output(self.FQ_UD, self.gpio.LOW)
+
+    def close(self):
+        pass
+
+
+class SpiDDS:
+    """AD9850 serial loader that shifts the whole frame in one SPI transfer
+
+    Wire the SPI MOSI to DATA and SCLK to W_CLK; FQ_UD stays on GPIO.
+    """
+    name = 'spi'
+
+    def __init__(self, gpio, spidev_module, fq_ud, bus=0, device=0, speed_hz=2000000):
+        if spidev_module is None:
+            raise RuntimeError("spidev is not installed - use the 'gpio' DDS driver")
+        self.gpio = gpio
+        self.FQ_UD = fq_ud
+        self.spi = spidev_module.SpiDev()
+        self.spi.open(bus, device)
+        self.spi.max_speed_hz = speed_hz
+        self.spi.mode = 0
+
+    def prepare(self, frames):
+        return np.asarray(frames, dtype=np.uint8).reshape(-1, DDS_FRAME_BYTES).tolist()
+
+    def load(self, frame):
+        self.shift(frame)
+        self.latch()
+
+    def shift(self, frame):
+        self.spi.xfer2(frame)
+
+    def latch(self):
+        self.gpio.output(self.FQ_UD, self.gpio.HIGH)
+        self.gpio.output(self.FQ_UD, self.gpio.LOW)
+
+    def close(self):
+        self.spi.close()
+
+
+DDS_DRIVERS = {
+    'gpio': lambda analyzer: GpioDDS(analyzer.hw.GPIO, analyzer.W_CLK, analyzer.FQ_UD, analyzer.DATA),
+    'spi': lambda analyzer: SpiDDS(analyzer.hw.GPIO, analyzer.hw.spidev, analyzer.FQ_UD,
+                                   analyzer.spi_bus, analyzer.spi_device),
+}
 
 
 # Modern color scheme (shadcn-inspired)
@@ -75,35 +606,75 @@ class ModernTheme:
 
 
 class ModernAntennaAnalyzer:
-    def __init__(self):
+    def __init__(self, dds_driver='gpio', settle_mode='fixed', acquisition_mode='single', data_rate=None,
+                 pipelined=False, oversample=1, mock_backend='verbose', seed=None):
         # Hardware configuration (same as before)
         self.W_CLK = 12  # violet white is gnd
         self.FQ_UD = 16  # white
         self.DATA = 20   # blue
         self.RESET = 21  # green
+        self.spi_bus = 0
+        self.spi_device = 0
+        self.dds_driver = dds_driver
+        self.dds = None
+        # Shift the next DDS word on an I/O thread while the current point is read
+        self.pipelined = pipelined
         self.ref_voltage = 3.3
         self.adc_resolution = 65536  # 16-bit ADS1115
         self.ads = None
         self.chan0 = None  # Magnitude channel
         self.chan1 = None  # Phase channel
+        self.acquisition_mode = acquisition_mode
+        self.data_rate = data_rate
+        self._last_channel = None
         self.hardware_ready = False
         self.mock_mode = MOCK_MODE
+        self.rng = np.random.default_rng(seed)  # demo antenna noise
+        self.mag_offset = MAG_OFFSET_V
+        self.mag_slope = MAG_SLOPE_V_PER_DB
+        self.hw = create_backend(mock_backend, (self.W_CLK, self.FQ_UD, self.DATA))
+        self.clock = self.hw.clock  # time module, or a virtual clock when simulated
+
+        # Detector settling after a retune: 'fixed' always sleeps settle_delay,
+        # 'adaptive' polls the magnitude channel until two readings agree
+        self.settle_mode = settle_mode
+        self.settle_time = 0.01
+        self.settle_tolerance = 0.005  # volts between consecutive readings
+        self.settle_timeout = 0.01     # never wait longer than the fixed delay
+        self.settle_profile = {}       # step-size bucket -> learned settle time
+        self.settle_step = 0.0002      # smallest probe-down of a learned time
+        self._last_freq = None
+
+        # Samples per channel and point: an int, or 'auto' to keep sampling
+        # until the SWR standard error drops below target_swr_precision
+        self.oversample = oversample
+        self.oversample_method = 'median'  # 'median', 'trimmed' or 'mean'
+        self.reject_outliers = False
+        self.target_swr_precision = 0.02
+        self.min_oversample = 4
+        self.max_oversample = 64
+
         self.setup_hardware()
 
     def setup_hardware(self):
         """Initialize GPIO and I2C ADC"""
         try:
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setup([self.W_CLK, self.FQ_UD, self.DATA, self.RESET], GPIO.OUT)
-            GPIO.output([self.W_CLK, self.FQ_UD, self.DATA], GPIO.LOW)
-            GPIO.output(self.RESET, GPIO.HIGH)
+            gpio = self.hw.GPIO
+            gpio.setmode(gpio.BCM)
+            gpio.setup([self.W_CLK, self.FQ_UD, self.DATA, self.RESET], gpio.OUT)
+            gpio.output([self.W_CLK, self.FQ_UD, self.DATA], gpio.LOW)
+            gpio.output(self.RESET, gpio.HIGH)
+
+            if self.dds_driver not in DDS_DRIVERS:
+                raise ValueError(f"Unknown DDS driver '{self.dds_driver}'")
+            self.dds = DDS_DRIVERS[self.dds_driver](self)
 
             # Initialize ADS1115 I2C ADC
-            if not self.mock_mode:
-                i2c = busio.I2C(board.SCL, board.SDA)
-                self.ads = ADS.ADS1115(i2c)
-                self.chan0 = AnalogIn(self.ads, ADS.P0)  # Magnitude
-                self.chan1 = AnalogIn(self.ads, ADS.P1)  # Phase
+            i2c = self.hw.busio.I2C(self.hw.board.SCL, self.hw.board.SDA)
+            self.ads = self.hw.ADS.ADS1115(i2c)
+            self.chan0 = self.hw.AnalogIn(self.ads, self.hw.ADS.P0)  # Magnitude
+            self.chan1 = self.hw.AnalogIn(self.ads, self.hw.ADS.P1)  # Phase
+            self.set_acquisition(self.acquisition_mode, self.data_rate)
 
             self.reset_dds()
             self.hardware_ready = True
@@ -117,186 +688,531 @@ class ModernAntennaAnalyzer:
             self.hardware_ready = False
 
     def reset_dds(self):
-        GPIO.output(self.RESET, GPIO.HIGH)
-        time.sleep(0.001)
-        GPIO.output(self.RESET, GPIO.LOW)
-        time.sleep(0.001)
-        GPIO.output(self.RESET, GPIO.HIGH)
+        gpio = self.hw.GPIO
+        gpio.output(self.RESET, gpio.HIGH)
+        self.clock.sleep(0.001)
+        gpio.output(self.RESET, gpio.LOW)
+        self.clock.sleep(0.001)
+        gpio.output(self.RESET, gpio.HIGH)
 
     def set_frequency(self, freq_hz):
         if not self.hardware_ready:
             return False
-        freq_word = int((freq_hz * 4294967296.0) / 125000000.0)
-        for i in range(32):
-            GPIO.output(self.DATA, (freq_word >> (31 - i)) & 1)
-            GPIO.output(self.W_CLK, GPIO.HIGH)
-            GPIO.output(self.W_CLK, GPIO.LOW)
-        for i in range(8):
-            GPIO.output(self.DATA, GPIO.LOW)
-            GPIO.output(self.W_CLK, GPIO.HIGH)
-            GPIO.output(self.W_CLK, GPIO.LOW)
-        GPIO.output(self.FQ_UD, GPIO.HIGH)
-        GPIO.output(self.FQ_UD, GPIO.LOW)
+        frame = dds_frames(dds_tuning_words(freq_hz))
+        return self.load_frame(self.dds.prepare(frame)[0])
+
+    def load_frame(self, payload):
+        """Load a frame prepared by the active DDS driver and latch it"""
+        if not self.hardware_ready:
+            return False
+        self.dds.load(payload)
         return True
 
+    def set_acquisition(self, mode='single', data_rate=None):
+        """Configure the ADS1115 speed/noise trade-off
+
+        'single' triggers one conversion per read (library default 128 SPS).
+        'continuous' keeps the ADC converting, defaults to the fastest 860 SPS
+        rate and only rewrites the mux when the channel changes.
+        """
+        if mode not in ('single', 'continuous'):
+            raise ValueError(f"Unknown acquisition mode '{mode}'")
+        if data_rate is None:
+            data_rate = ADS1115_DATA_RATES[-1] if mode == 'continuous' else ADS1115_DEFAULT_RATE
+        if data_rate not in ADS1115_DATA_RATES:
+            raise ValueError(f"ADS1115 data rate must be one of {ADS1115_DATA_RATES}")
+        self.acquisition_mode = mode
+        self.data_rate = data_rate
+        self._last_channel = None
+        if self.ads is not None:
+            self.ads.data_rate = data_rate
+            self.ads.mode = self.hw.Mode.CONTINUOUS if mode == 'continuous' else self.hw.Mode.SINGLE
+
+    @property
+    def bus_stats(self):
+        """Counters from the instrumented mock backend, None otherwise"""
+        return self.hw.stats
+
+    @property
+    def conversion_time(self):
+        return 1.0 / (self.data_rate or ADS1115_DEFAULT_RATE)
+
+    @property
+    def settle_delay(self):
+        """Fixed wait after a retune before the first reading is trusted"""
+        if self.acquisition_mode != 'continuous':
+            return self.settle_time
+        # The first read returns the last finished conversion, which must have
+        # started after the detector settled: up to two periods after settle_time
+        return self.settle_time + 2 * self.conversion_time
+
     def read_adc(self, channel):
         if not self.hardware_ready:
             return 0
         try:
-            if self.mock_mode:
-                # Mock ADC reading for demo
-                return random.uniform(0.5, 2.5)
+            # Read from ADS1115
+            if channel == 0:
+                voltage = self.chan0.voltage
+            elif channel == 1:
+                voltage = self.chan1.voltage
             else:
-                # Read from ADS1115
-                if channel == 0:
-                    return self.chan0.voltage
-                elif channel == 1:
-                    return self.chan1.voltage
-                else:
-                    return 0
+                return 0
+            self._last_channel = channel
+            return voltage
         except:
             return 0
 
+    def read_adc_samples(self, channel, count):
+        """Read `count` samples of one channel into a NumPy buffer"""
+        # Continuous mode only yields a new value once per conversion period
+        wait = self.conversion_time if self.acquisition_mode == 'continuous' else 0
+        samples = np.empty(count)
+        for i in range(count):
+            if wait and i:
+                self.clock.sleep(wait)
+            samples[i] = self.read_adc(channel)
+        return samples
+
+    def swr_standard_error(self, mag_samples):
+        """SWR uncertainty of the averaged magnitude samples"""
+        if len(mag_samples) < 2:
+            return float('inf')
+        center = float(np.median(mag_samples))
+        step = 0.001
+        slope = abs(self.mag_to_swr(center + step) - self.mag_to_swr(center - step)) / (2 * step)
+        return slope * np.std(mag_samples, ddof=1) / np.sqrt(len(mag_samples))
+
+    def read_oversampled(self, first_mag=None):
+        """Averaged (magnitude, phase) over several samples per channel"""
+        if self.oversample == 'auto':
+            mag_samples = self.read_adc_samples(0, self.min_oversample)
+            if first_mag is not None:
+                mag_samples = np.append(mag_samples, first_mag)
+            # Double the buffer until the precision target is met
+            while (len(mag_samples) < self.max_oversample
+                   and self.swr_standard_error(mag_samples) > self.target_swr_precision):
+                extra = min(len(mag_samples), self.max_oversample - len(mag_samples))
+                mag_samples = np.concatenate((mag_samples, self.read_adc_samples(0, extra)))
+        else:
+            count = int(self.oversample)
+            mag_samples = self.read_adc_samples(0, count)
+        phase_samples = self.read_adc_samples(1, len(mag_samples))
+        return (robust_average(mag_samples, self.oversample_method, self.reject_outliers),
+                robust_average(phase_samples, self.oversample_method, self.reject_outliers))
+
+    def read_channels(self):
+        """Read (magnitude, phase) starting on the channel the ADC is muxed to"""
+        if self._last_channel == 1:
+            phase_voltage = self.read_adc(1)
+            mag_voltage = self.read_adc(0)
+        else:
+            mag_voltage = self.read_adc(0)
+            phase_voltage = self.read_adc(1)
+        return mag_voltage, phase_voltage
+
+    def settle_bucket(self, step_hz):
+        """Group frequency steps by power of two for the learned settle profile"""
+        if step_hz is None:
+            return None
+        return int(np.ceil(np.log2(max(step_hz, 1.0))))
+
+    def wait_for_settle(self, freq_hz):
+        """Wait for the detector after retuning to freq_hz
+
+        Returns the last magnitude reading in adaptive mode so the caller can
+        reuse it, otherwise None.
+        """
+        step = None if self._last_freq is None else abs(freq_hz - self._last_freq)
+        self._last_freq = freq_hz
+        if self.settle_mode != 'adaptive':
+            self.clock.sleep(self.settle_delay)
+            return None
+
+        bucket = self.settle_bucket(step)
+        learned = self.settle_profile.get(bucket)
+        start = self.clock.perf_counter()
+        if learned:
+            self.clock.sleep(learned)
+
+        # In continuous mode a re-read returns the latest finished conversion,
+        # so wait one conversion period to compare against a fresh sample
+        poll_wait = self.conversion_time if self.acquisition_mode == 'continuous' else 0
+        # Only the wait before the first of the two agreeing readings is
+        # learned; the readings themselves are paid again on every point
+        waited = self.clock.perf_counter() - start
+        previous = self.read_adc(0)
+        polls = 0
+        while True:
+            if poll_wait:
+                self.clock.sleep(poll_wait)
+            before = self.clock.perf_counter() - start
+            reading = self.read_adc(0)
+            if abs(reading - previous) <= self.settle_tolerance:
+                break
+            if self.clock.perf_counter() - start >= self.settle_timeout:
+                # Never converged: remember the worst case for this step size
+                self.settle_profile[bucket] = self.settle_timeout
+                return reading
+            previous = reading
+            waited = before
+            polls += 1
+
+        if learned is None or polls:
+            self.settle_profile[bucket] = min(waited, self.settle_timeout)
+        else:
+            # Settled on the first check - probe a shorter wait next time
+            shorter = learned - max(learned * 0.2, self.settle_step)
+            self.settle_profile[bucket] = max(shorter, 0.0)
+        return reading
+
     def simulate_antenna_response(self, freq_hz):
         """Simulate realistic antenna response"""
-        resonant_freq = 14.2e6
-        bandwidth = 2.0e6
-        freq_offset = abs(freq_hz - resonant_freq)
-        normalized_offset = freq_offset / bandwidth
-        base_swr = 1.1 + 2.0 * (normalized_offset ** 2)
-        harmonic_effect = 0.3 * np.sin(freq_hz / 1e6 * 0.5)
-        random_variation = random.uniform(-0.1, 0.1)
-        swr = base_swr + harmonic_effect + random_variation
-        return max(1.0, min(10.0, swr))
-
-    def measure_point(self, freq_hz):
-        if not self.set_frequency(freq_hz):
+        return float(simulate_antenna_swr(freq_hz, self.rng))
+
+    def simulate_antenna_sweep(self, frequencies):
+        """Simulated (swr, mag_voltage) arrays for a whole frequency grid"""
+        swr = simulate_antenna_swr(frequencies, self.rng)
+        return swr, simulated_mag_voltage(swr)
+
+    def measure_point(self, freq_hz, payload=None):
+        tuned = self.load_frame(payload) if payload is not None else self.set_frequency(freq_hz)
+        if not tuned:
             return None
-        time.sleep(0.01)
-        mag_voltage = self.read_adc(0)
-        phase_voltage = self.read_adc(1)
-
-        if self.mock_mode:
-            swr = self.simulate_antenna_response(freq_hz)
-            reflection_coeff = (swr - 1) / (swr + 1)
-            mag_db = 20 * np.log10(reflection_coeff + 0.01)
-            mag_voltage = 0.9 + mag_db * 0.03
-            mag_voltage = max(0.5, min(2.5, mag_voltage))
+        return self.acquire_point(freq_hz)
+
+    def acquire_point(self, freq_hz):
+        """Settle, read and convert one point at the frequency currently latched"""
+        mag_voltage, phase_voltage = self.capture_point(freq_hz)
+        return self.convert_measurements([freq_hz], [mag_voltage], [phase_voltage])[0]
+
+    def capture_point(self, freq_hz):
+        """Raw (magnitude, phase) voltages at the frequency currently latched"""
+        settled = self.wait_for_settle(freq_hz)
+        if self.oversample != 1:
+            return self.read_oversampled(settled)
+        if settled is not None:
+            return settled, self.read_adc(1)
+        return self.read_channels()
+
+    def mag_to_swr(self, mag_voltage):
+        return float(voltages_to_swr(mag_voltage, self.mag_offset, self.mag_slope))
+
+    def convert_measurements(self, frequencies, mag_voltages, phase_voltages, out=None):
+        """Turn raw captured voltages into a SweepResult in one batch (written into out if given)"""
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+        if self.hw.simulates_antenna:
+            swr, mag_voltages = self.simulate_antenna_sweep(frequencies)
         else:
-            mag_db = (mag_voltage - 0.9) / 0.03
-            reflection_coeff = 10 ** (mag_db / 20.0)
-            reflection_coeff = min(reflection_coeff, 0.99)
-            if reflection_coeff >= 1.0:
-                swr = 999
+            swr = voltages_to_swr(mag_voltages, self.mag_offset, self.mag_slope)
+        if out is None:
+            return SweepResult(frequencies, swr, mag_voltages, phase_voltages)
+        out.swr[:] = swr
+        out.mag_voltage[:] = mag_voltages
+        return out
+
+    def reprocess(self, measurements, mag_offset=None, mag_slope=None):
+        """Recompute SWR of stored measurements from their raw magnitude voltages,
+        optionally with new detector calibration constants"""
+        result = SweepResult.from_measurements(measurements)
+        swr = voltages_to_swr(result.mag_voltage,
+                              self.mag_offset if mag_offset is None else mag_offset,
+                              self.mag_slope if mag_slope is None else mag_slope)
+        return SweepResult(result.frequency, swr, result.mag_voltage, result.phase_voltage)
+
+    def frequency_sweep(self, start_freq, stop_freq, points=100, progress_callback=None, plan=None,
+                        point_callback=None, early_stop=None, out=None):
+        """Sweep the plan (or a linear grid); returns a SweepResult
+
+        With point_callback, each point is converted as soon as it is read and
+        point_callback(measurement, running_rating) is called with the
+        provisional RunningRating; otherwise conversion is one batch at the end.
+        early_stop is a policy (or list of policies) such as GuaranteedFailStop;
+        when one fires, the points so far are returned flagged as truncated.
+        out is a SweepResult of the plan's length that is filled in place and
+        returned instead of allocating new result arrays; the SWR conversion
+        still creates temporaries on every pass.
+        """
+        if plan is None:
+            plan = SweepPlan.linspace(start_freq, stop_freq, points)
+        if not self.hardware_ready:
+            return SweepResult()
+        if self.pipelined:
+            return self.pipelined_sweep(plan, progress_callback, point_callback, early_stop, out)
+        total = len(plan)
+        result = self.sweep_buffer(plan, out)
+        policies = self.start_early_stop(early_stop, total)
+        running = RunningRating(total) if point_callback or policies else None
+        payloads = plan.payloads(self.dds)
+        for i, (freq, payload) in enumerate(zip(plan.frequencies.tolist(), payloads)):
+            self.load_frame(payload)
+            result.mag_voltage[i], result.phase_voltage[i] = self.capture_point(freq)
+            if running:
+                self.stream_point(result, i, running, point_callback)
+            if progress_callback:
+                progress_callback(i + 1, total)
+            reason = self.early_stop_reason(policies, running, result, i)
+            if reason:
+                return result.truncate(i + 1, reason)
+            if i % 10 == 0:
+                self.clock.sleep(0.001)
+        if running:
+            return result
+        return self.convert_measurements(result.frequency, result.mag_voltage, result.phase_voltage, out)
+
+    def sweep_buffer(self, plan, out=None):
+        """Preallocated SweepResult for the plan's grid, or out made ready for reuse"""
+        total = len(plan)
+        if out is None:
+            return SweepResult(plan.frequencies, np.empty(total), np.empty(total), np.empty(total))
+        if len(out) != total:
+            raise ValueError(f"Output buffer holds {len(out)} points, sweep plan has {total}")
+        out.frequency[:] = plan.frequencies
+        out.truncated = False
+        out.stop_reason = None
+        return out
+
+    def stream_point(self, result, index, running, point_callback=None):
+        """Convert one captured point of a sweep buffer in place and report it"""
+        span = slice(index, index + 1)
+        point = self.convert_measurements(result.frequency[span], result.mag_voltage[span],
+                                          result.phase_voltage[span])[0]
+        result.swr[index] = point['swr']
+        result.mag_voltage[index] = point['mag_voltage']
+        running.add(point['swr'])
+        if point_callback:
+            point_callback(point, running)
+
+    def start_early_stop(self, early_stop, total):
+        if early_stop is None:
+            return ()
+        policies = tuple(early_stop) if isinstance(early_stop, (list, tuple)) else (early_stop,)
+        for policy in policies:
+            policy.reset(total)
+        return policies
+
+    def early_stop_reason(self, policies, running, result, index):
+        """Reason of the first policy that wants the sweep stopped, or None"""
+        for policy in policies:
+            reason = policy.check(running, result, index)
+            if reason:
+                return reason
+        return None
+
+    def refinement_intervals(self, frequencies, swr_values):
+        """Intervals around the SWR minimum and the 2:1 / 3:1 crossings"""
+        intervals = set()
+        last = len(frequencies) - 1
+        best = int(np.argmin(swr_values))
+        if best > 0:
+            intervals.add((frequencies[best - 1], frequencies[best]))
+        if best < last:
+            intervals.add((frequencies[best], frequencies[best + 1]))
+        for threshold in (2.0, 3.0):
+            above = swr_values > threshold
+            for i in np.flatnonzero(above[:-1] != above[1:]):
+                intervals.add((frequencies[i], frequencies[i + 1]))
+        return sorted(intervals)
+
+    def adaptive_sweep(self, start_freq, stop_freq, resolution_hz, coarse_points=21, refine_points=3,
+                       max_points=1000, progress_callback=None, cancel=None):
+        """Coarse sweep refined around the resonance and SWR crossings
+
+        Intervals next to the SWR minimum and the 2:1 / 3:1 crossing points
+        are subdivided until they are narrower than resolution_hz. Returns
+        a SweepResult sorted by frequency on a non-uniform grid. A CancelStop
+        passed as cancel ends it early with the points measured so far.
+        """
+        if not self.hardware_ready:
+            return SweepResult()
+        measured = {}  # tuning word -> measurement
+
+        def cancelled():
+            return cancel is not None and cancel.event.is_set()
+
+        def measure(frequencies):
+            plan = SweepPlan(frequencies)
+            fresh = [(word, freq, payload) for word, freq, payload
+                     in zip(plan.words.tolist(), plan.frequencies.tolist(), plan.payloads(self.dds))
+                     if word not in measured]
+            fresh = fresh[:max(0, max_points - len(measured))]
+            done = len(measured)
+            for i, (word, freq, payload) in enumerate(fresh):
+                if cancelled():
+                    break
+                measurement = self.measure_point(freq, payload)
+                if measurement:
+                    measured[word] = measurement
+                if progress_callback:
+                    progress_callback(done + i + 1, done + len(fresh))
+            return len(fresh)
+
+        def ordered():
+            return SweepResult.from_measurements(sorted(measured.values(), key=lambda m: m['frequency']))
+
+        measure(np.linspace(start_freq, stop_freq, coarse_points))
+        while len(measured) < max_points and not cancelled():
+            result = ordered()
+            intervals = [(lo, hi) for lo, hi in self.refinement_intervals(result.frequency, result.swr)
+                         if hi - lo > resolution_hz]
+            if not intervals:
+                break
+            refined = np.concatenate([np.linspace(lo, hi, refine_points + 2)[1:-1] for lo, hi in intervals])
+            if not measure(refined):
+                break
+        if cancelled():
+            # Only a cancel during the coarse pass leaves part of the band unmeasured
+            return ordered().truncate(len(measured), "cancelled", max(coarse_points, len(measured)))
+        return ordered()
+
+    def find_resonance(self, start_freq, stop_freq, tol_hz=1e3, bracket_points=11, samples=3, noise_span=20):
+        """Locate the minimum-SWR frequency with a golden-section search
+
+        A short coarse scan brackets the dip, then golden-section search on
+        live measure_point calls narrows it to tol_hz. Once the bracket is
+        within noise_span * tol_hz every probe is the median of `samples`
+        readings so noise near the flat bottom does not mislead the search.
+        """
+        if not self.hardware_ready:
+            return None
+        evaluations = 0
+
+        def swr_at(freq, repeats=1):
+            nonlocal evaluations
+            values = []
+            for _ in range(repeats):
+                measurement = self.measure_point(freq)
+                evaluations += 1
+                if measurement:
+                    values.append(measurement['swr'])
+            return float(np.median(values)) if values else float('inf')
+
+        grid = np.linspace(start_freq, stop_freq, bracket_points)
+        coarse = [swr_at(freq) for freq in grid]
+        best = int(np.argmin(coarse))
+        lo = grid[max(best - 1, 0)]
+        hi = grid[min(best + 1, len(grid) - 1)]
+
+        inv_phi = (np.sqrt(5) - 1) / 2
+        c = hi - inv_phi * (hi - lo)
+        d = lo + inv_phi * (hi - lo)
+        fc, fd = swr_at(c), swr_at(d)
+        fc_repeats = fd_repeats = 1
+        while hi - lo > tol_hz:
+            repeats = samples if hi - lo <= noise_span * tol_hz else 1
+            # Re-measure the kept probes when entering the noisy region
+            if fc_repeats < repeats:
+                fc, fc_repeats = swr_at(c, repeats), repeats
+            if fd_repeats < repeats:
+                fd, fd_repeats = swr_at(d, repeats), repeats
+            if fc < fd:
+                hi, d, fd, fd_repeats = d, c, fc, fc_repeats
+                c = hi - inv_phi * (hi - lo)
+                fc, fc_repeats = swr_at(c, repeats), repeats
             else:
-                swr = (1 + reflection_coeff) / (1 - reflection_coeff)
-                swr = min(swr, 50)
+                lo, c, fc, fc_repeats = c, d, fd, fd_repeats
+                d = lo + inv_phi * (hi - lo)
+                fd, fd_repeats = swr_at(d, repeats), repeats
 
+        frequency = float(lo + hi) / 2
         return {
-            'frequency': freq_hz,
-            'swr': swr,
-            'mag_voltage': mag_voltage,
-            'phase_voltage': phase_voltage
+            'frequency': frequency,
+            'swr': swr_at(frequency, samples),
+            'uncertainty_hz': float(hi - lo) / 2,
+            'evaluations': evaluations
         }
 
-    def frequency_sweep(self, start_freq, stop_freq, points=100, progress_callback=None):
-        frequencies = np.linspace(start_freq, stop_freq, points)
-        measurements = []
-        for i, freq in enumerate(frequencies):
-            measurement = self.measure_point(freq)
-            if measurement:
-                measurements.append(measurement)
-            if progress_callback:
-                progress_callback(i + 1, points)
-            if i % 10 == 0:
-                time.sleep(0.001)
-        return measurements
+    def pipelined_sweep(self, plan, progress_callback=None, point_callback=None, early_stop=None, out=None):
+        """Sweep that shifts word N+1 into the DDS while point N settles and converts
+
+        The AD9850 only switches its output on FQ_UD, so the next word can sit
+        in the input register while the ADC is still reading the current one.
+        """
+        total = len(plan)
+        if not total:
+            return SweepResult()
+        result = self.sweep_buffer(plan, out)
+        policies = self.start_early_stop(early_stop, total)
+        running = RunningRating(total) if point_callback or policies else None
+        payloads = plan.payloads(self.dds)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='dds-io') as io:
+            self.dds.shift(payloads[0])
+            for i, freq in enumerate(plan.frequencies.tolist()):
+                self.dds.latch()
+                pending = io.submit(self.dds.shift, payloads[i + 1]) if i + 1 < total else None
+                result.mag_voltage[i], result.phase_voltage[i] = self.capture_point(freq)
+                if pending:
+                    pending.result()
+                if running:
+                    self.stream_point(result, i, running, point_callback)
+                if progress_callback:
+                    progress_callback(i + 1, total)
+                reason = self.early_stop_reason(policies, running, result, i)
+                if reason:
+                    return result.truncate(i + 1, reason)
+        if running:
+            return result
+        return self.convert_measurements(result.frequency, result.mag_voltage, result.phase_voltage, out)
 
     def rate_antenna_performance(self, measurements):
-        if not measurements:
+        if not len(measurements):
             return {"rating": "F", "score": 0, "analysis": "No measurements available"}
 
-        swr_values = [m['swr'] for m in measurements]
-        min_swr = min(swr_values)
-        avg_swr = np.mean(swr_values)
-        max_swr = max(swr_values)
-
-        excellent_points = sum(1 for swr in swr_values if swr <= 1.5)
-        good_points = sum(1 for swr in swr_values if swr <= 2.0)
-        acceptable_points = sum(1 for swr in swr_values if swr <= 3.0)
-
-        total_points = len(swr_values)
-        excellent_ratio = excellent_points / total_points
-        good_ratio = good_points / total_points
-        acceptable_ratio = acceptable_points / total_points
-
-        score = 0
-        if excellent_ratio >= 0.8:
-            score = 90 + (excellent_ratio - 0.8) * 50
-        elif good_ratio >= 0.6:
-            score = 70 + (good_ratio - 0.6) * 50
-        elif acceptable_ratio >= 0.4:
-            score = 50 + (acceptable_ratio - 0.4) * 50
-        else:
-            score = acceptable_ratio * 125
-
-        if min_swr <= 1.2:
-            score += 5
-        elif min_swr <= 1.5:
-            score += 2
-        if good_ratio >= 0.7:
-            score += 3
-
-        score = min(100, max(0, score))
-
-        if score >= 90:
-            rating = "A+"
-        elif score >= 85:
-            rating = "A"
-        elif score >= 80:
-            rating = "A-"
-        elif score >= 75:
-            rating = "B+"
-        elif score >= 70:
-            rating = "B"
-        elif score >= 65:
-            rating = "B-"
-        elif score >= 60:
-            rating = "C+"
-        elif score >= 55:
-            rating = "C"
-        elif score >= 50:
-            rating = "C-"
-        elif score >= 40:
-            rating = "D"
-        else:
-            rating = "F"
+        result = SweepResult.from_measurements(measurements)
+        # Adaptive sweeps: ratios are fractions of the band, not of the points
+        weights = grid_weights(result.frequency)
+        # Points an early stop skipped are rated poor - the policies stop
+        # because they expect the rest of the band to be above 3:1
+        unmeasured = max(0, result.planned_points - len(result))
+        rated = rate_swr(result.swr, weights, unmeasured)
+        stats = {key: value[0].item() for key, value in rated.items()}
+        total_points = stats["total_points"]
+        share = "{:.1%}" if weights is None else "{:.1%} of band"
 
         analysis = []
-        analysis.append(f"Minimum SWR: {min_swr:.2f}")
-        analysis.append(f"Average SWR: {avg_swr:.2f}")
-        analysis.append(f"Maximum SWR: {max_swr:.2f}")
-        analysis.append(f"Excellent (≤1.5): {excellent_points}/{total_points} ({excellent_ratio:.1%})")
-        analysis.append(f"Good (≤2.0): {good_points}/{total_points} ({good_ratio:.1%})")
-        analysis.append(f"Acceptable (≤3.0): {acceptable_points}/{total_points} ({acceptable_ratio:.1%})")
+        analysis.append(f"Minimum SWR: {stats['min_swr']:.2f}")
+        analysis.append(f"Average SWR: {stats['avg_swr']:.2f}")
+        analysis.append(f"Maximum SWR: {stats['max_swr']:.2f}")
+        for label, key in (("Excellent (≤1.5)", "excellent"), ("Good (≤2.0)", "good"),
+                           ("Acceptable (≤3.0)", "acceptable")):
+            ratio = share.format(stats[f"{key}_ratio"])
+            analysis.append(f"{label}: {stats[f'{key}_points']}/{total_points} ({ratio})")
+        if unmeasured:
+            analysis.append(f"Not measured ({result.stop_reason}): {unmeasured}/{total_points}, rated poor")
 
         return {
-            "rating": rating,
-            "score": score,
+            "rating": stats["rating"],
+            "score": stats["score"],
             "analysis": "\n".join(analysis),
-            "stats": {
-                "min_swr": min_swr,
-                "avg_swr": avg_swr,
-                "max_swr": max_swr,
-                "excellent_ratio": excellent_ratio,
-                "good_ratio": good_ratio,
-                "acceptable_ratio": acceptable_ratio
-            }
+            "stats": {key: stats[key] for key in
+                      ("min_swr", "avg_swr", "max_swr", "excellent_ratio", "good_ratio", "acceptable_ratio")}
         }
 
+    def rate_sweeps(self, sweeps):
+        """Re-rate many sweeps at once (2-D SWR array or list of results/measurement lists)
+
+        Equal-length uniform sweeps are rated in one vectorized call; returns
+        the same rating/score/stats per sweep as rate_antenna_performance.
+        """
+        if isinstance(sweeps, np.ndarray):
+            batches = [rate_swr(sweeps)]
+        else:
+            results = [SweepResult.from_measurements(sweep) for sweep in sweeps]
+            if len({len(result) for result in results}) == 1 and \
+                    all(grid_weights(result.frequency) is None for result in results):
+                batches = [rate_swr(np.vstack([result.swr for result in results]))]
+            else:
+                batches = [rate_swr(result.swr, grid_weights(result.frequency)) for result in results]
+        return [{"rating": str(rated["rating"][i]),
+                 "score": float(rated["score"][i]),
+                 "stats": {key: float(rated[key][i]) for key in
+                           ("min_swr", "avg_swr", "max_swr", "excellent_ratio", "good_ratio", "acceptable_ratio")}}
+                for rated in batches for i in range(len(rated["score"]))]
+
     def cleanup(self):
         if self.hardware_ready:
-            GPIO.cleanup()
+            if self.dds:
+                self.dds.close()
+            self.hw.GPIO.cleanup()
 
 
 class ModernAntennaGUI:
@@ -321,6 +1237,14 @@ class ModernAntennaGUI:
 
         self.analyzer = ModernAntennaAnalyzer()
         self.measurements = []
+        self.live_rating = None
+        self.sweep_thread = None
+        self.sweep_cancel = None
+        self.sweep_queue = queue.Queue()
+        self.live_line = None
+        self.live_background = None
+        self.monitor_lock = threading.Lock()
+        self.monitor_rate = None
         self._compact_buttons = []
 
         self.setup_modern_gui()
@@ -567,6 +1491,10 @@ class ModernAntennaGUI:
                                     highlightthickness=0, relief='flat')
         progress_canvas.pack(fill='x')
         self.progress_canvas = progress_canvas
+        # One bar item, resized with coords() as the sweep advances
+        self.progress_bar = progress_canvas.create_rectangle(0, 0, 0, 0, fill=self.current_theme['accent'],
+                                                             outline="")
+        self.progress_drawn_at = 0.0
 
         self.status_var = tk.StringVar(value="Ready to test" + (" - Demo Mode" if MOCK_MODE else ""))
         status_label = tk.Label(sweep_row, textvariable=self.status_var,
@@ -635,6 +1563,28 @@ class ModernAntennaGUI:
                                 relief='solid', bd=1)
         points_entry.pack(fill='x', pady=(1, 0))
 
+        # Adaptive: coarse pass refined around resonance to the same resolution
+        self.adaptive_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(freq_frame, text="Adaptive (refine resonance)",
+                       variable=self.adaptive_var,
+                       font=('Segoe UI', 8),
+                       bg=self.current_theme['bg_card'],
+                       fg=self.current_theme['text_primary'],
+                       selectcolor=self.current_theme['bg_muted'],
+                       activebackground=self.current_theme['bg_card'],
+                       activeforeground=self.current_theme['text_primary']).pack(anchor='w', pady=(3, 0))
+
+        # Live monitor: sweep the band over and over for real-time tuning
+        self.monitor_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(freq_frame, text="Live monitor (repeat sweeps)",
+                       variable=self.monitor_var,
+                       font=('Segoe UI', 8),
+                       bg=self.current_theme['bg_card'],
+                       fg=self.current_theme['text_primary'],
+                       selectcolor=self.current_theme['bg_muted'],
+                       activebackground=self.current_theme['bg_card'],
+                       activeforeground=self.current_theme['text_primary']).pack(anchor='w')
+
     def setup_results_panel(self, parent):
         """Setup modern results panel with pagination system"""
         results_card, results_content = self.create_modern_card(parent, "Test Results")
@@ -738,6 +1688,7 @@ class ModernAntennaGUI:
         canvas_widget.pack(fill='both', expand=True)
         # Resize plot to fill the card when the widget size changes
         canvas_widget.bind('<Configure>', self._on_plot_resize)
+        self.canvas.mpl_connect('draw_event', self._on_plot_draw)
 
     def _on_plot_resize(self, event=None):
         try:
@@ -813,64 +1764,206 @@ class ModernAntennaGUI:
         widget.config(takefocus=1)
         widget.bind("<B1-Motion>", lambda e: "break", add="+")
 
+    PROGRESS_MAX_FPS = 15
+
     def update_progress(self, current, total):
-        """Update modern progress bar"""
+        """Move the progress bar; redraws are capped at PROGRESS_MAX_FPS whatever the point count"""
+        now = time.monotonic()
+        if current < total and now - self.progress_drawn_at < 1.0 / self.PROGRESS_MAX_FPS:
+            return
+        self.progress_drawn_at = now
         progress = (current / total) * 100
         self.progress_var.set(progress)
-        self.progress_canvas.delete("all")
         canvas_width = self.progress_canvas.winfo_width()
         if canvas_width > 1:
-            progress_width = (progress / 100) * canvas_width
-            self.progress_canvas.create_rectangle(0, 0, progress_width, 6,
-                                                  fill=self.current_theme['accent'],
-                                                  outline="")
-        self.status_var.set(f"Measuring point {current}/{total}" + (" (Demo)" if MOCK_MODE else ""))
-        self.root.update_idletasks()
+            self.progress_canvas.coords(self.progress_bar, 0, 0, (progress / 100) * canvas_width,
+                                        self.progress_canvas.winfo_height())
+        status = f"Measuring point {current}/{total}"
+        if self.live_rating and self.live_rating['points']:
+            status += f" - provisional {self.live_rating['rating']}, min SWR {self.live_rating['min_swr']:.2f}"
+        self.status_var.set(status + (" (Demo)" if MOCK_MODE else ""))
+
+    SWEEP_POLL_MS = 50
 
     def one_click_sweep(self):
-        """Perform complete sweep with modern UI feedback"""
+        """Start a sweep on a worker thread; while one is running the button cancels it"""
+        if self.sweep_thread:
+            self.cancel_sweep()
+            return
         try:
             start_freq = float(self.start_freq_var.get()) * 1e6
             stop_freq = float(self.stop_freq_var.get()) * 1e6
             points = int(self.points_var.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
 
-            if start_freq >= stop_freq:
-                messagebox.showerror("Error", "Start frequency must be less than stop frequency")
-                return
-            if points < 10 or points > 1000:
-                messagebox.showerror("Error", "Points must be between 10 and 1000")
-                return
-            if not self.analyzer.hardware_ready:
-                messagebox.showerror("Error", "Hardware not ready. Check connections.")
-                return
-
-            self.sweep_button.configure(state='disabled', text="Sweeping...")
-            self.progress_var.set(0)
-            self.status_var.set("Starting sweep..." + (" (Demo)" if MOCK_MODE else ""))
-
-            start_time = time.time()
-            self.measurements = self.analyzer.frequency_sweep(
-                start_freq, stop_freq, points, self.update_progress
-            )
-            sweep_time = time.time() - start_time
+        if start_freq >= stop_freq:
+            messagebox.showerror("Error", "Start frequency must be less than stop frequency")
+            return
+        if points < 10 or points > 1000:
+            messagebox.showerror("Error", "Points must be between 10 and 1000")
+            return
+        if not self.analyzer.hardware_ready:
+            messagebox.showerror("Error", "Hardware not ready. Check connections.")
+            return
 
-            self.status_var.set("Analyzing results..." + (" (Demo)" if MOCK_MODE else ""))
-            rating_result = self.analyzer.rate_antenna_performance(self.measurements)
+        self.live_rating = None
+        self.monitor_rate = None
+        self.sweep_cancel = CancelStop()
+        self.sweep_queue = queue.Queue()
+        if self.monitor_var.get() and not self.adaptive_var.get():
+            self.start_monitor(start_freq, stop_freq, points)
+            return
+        self.sweep_button.configure(text="CANCEL")
+        self.progress_var.set(0)
+        self.status_var.set("Starting sweep..." + (" (Demo)" if MOCK_MODE else ""))
+        if not self.adaptive_var.get():
+            self.start_live_plot(start_freq, stop_freq, points)
+
+        self.sweep_start_time = time.time()
+        self.sweep_thread = threading.Thread(target=self.sweep_worker, daemon=True,
+                                             args=(start_freq, stop_freq, points, self.adaptive_var.get()))
+        self.sweep_thread.start()
+        self.root.after(self.SWEEP_POLL_MS, self.poll_sweep_queue)
+
+    def sweep_worker(self, start_freq, stop_freq, points, adaptive):
+        """Runs the sweep off the Tk thread; results only leave through sweep_queue"""
+        post = self.sweep_queue.put
+        try:
+            if adaptive:
+                result = self.analyzer.adaptive_sweep(
+                    start_freq, stop_freq, (stop_freq - start_freq) / (points - 1),
+                    coarse_points=max(11, points // 10), max_points=points,
+                    progress_callback=lambda current, total: post(('progress', current, total)),
+                    cancel=self.sweep_cancel
+                )
+            else:
+                result = self.analyzer.frequency_sweep(
+                    start_freq, stop_freq, points,
+                    lambda current, total: post(('progress', current, total)),
+                    # The worker keeps updating running; hand the Tk thread a snapshot
+                    point_callback=lambda measurement, running: post(('point', measurement, running.as_dict())),
+                    early_stop=self.sweep_cancel
+                )
+            post(('done', result))
+        except Exception as e:
+            post(('error', e))
+
+    def start_monitor(self, start_freq, stop_freq, points):
+        """Sweep the band repeatedly until stopped, updating the live plot in place"""
+        plan = SweepPlan.linspace(start_freq, stop_freq, points)
+        self.sweep_button.configure(text="STOP")
+        self.status_var.set("Live monitor starting..." + (" (Demo)" if MOCK_MODE else ""))
+        self.start_live_plot(start_freq, stop_freq, len(plan))
+        self.live_freqs[:] = plan.frequencies / 1e6
+        self.sweep_start_time = time.time()
+        self.sweep_thread = threading.Thread(target=self.monitor_worker, args=(plan,), daemon=True)
+        self.sweep_thread.start()
+        self.root.after(self.SWEEP_POLL_MS, self.poll_sweep_queue)
+
+    def monitor_worker(self, plan):
+        """Reuses one plan and two buffers for every sweep; the plot copy is taken under monitor_lock"""
+        post = self.sweep_queue.put
+        try:
+            # Alternate two buffers so a pass cut short by STOP cannot
+            # overwrite the last complete one
+            buffers = [self.analyzer.sweep_buffer(plan), self.analyzer.sweep_buffer(plan)]
+            sweeps = 0
+            started = time.perf_counter()
+            while not self.sweep_cancel.event.is_set():
+                result = self.analyzer.frequency_sweep(None, None, plan=plan, early_stop=self.sweep_cancel,
+                                                       out=buffers[sweeps % 2])
+                if result.truncated:
+                    break
+                sweeps += 1
+                with self.monitor_lock:
+                    np.copyto(self.live_swr, result.swr)
+                    self.live_count = len(result)
+                post(('frame', sweeps, sweeps / (time.perf_counter() - started)))
+            # Only the last complete sweep becomes the result (for rating and saving)
+            post(('done', buffers[(sweeps - 1) % 2][:] if sweeps else SweepResult()))
+        except Exception as e:
+            post(('error', e))
+
+    def show_monitor_frame(self, sweeps, rate):
+        self.monitor_rate = (sweeps, rate)
+        with self.monitor_lock:
+            self.draw_live_plot()
+            best = int(np.argmin(self.live_swr[:self.live_count]))
+            best_swr = self.live_swr[best]
+        self.status_var.set(f"Live: {rate:.1f} sweeps/s - min SWR {best_swr:.2f} at {self.live_freqs[best]:.3f} MHz"
+                            + (" (Demo)" if MOCK_MODE else ""))
+
+    def poll_sweep_queue(self):
+        """Drain worker messages on the Tk thread, then reschedule"""
+        progress = None
+        new_points = False
+        frame = None
+        while True:
+            try:
+                message = self.sweep_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == 'progress':
+                progress = message[1:]
+            elif message[0] == 'point':
+                self.add_live_point(message[1])
+                self.live_rating = message[2]
+                new_points = True
+            elif message[0] == 'frame':
+                frame = message[1:]
+            else:
+                if progress:
+                    self.update_progress(*progress)
+                self.finish_sweep(*message)
+                return
+        if new_points:
+            self.draw_live_plot()
+        if frame:
+            self.show_monitor_frame(*frame)
+        if progress:
+            self.update_progress(*progress)
+        self.root.after(self.SWEEP_POLL_MS, self.poll_sweep_queue)
+
+    def cancel_sweep(self):
+        if self.sweep_cancel:
+            self.sweep_cancel.cancel()
+            self.sweep_button.configure(state='disabled', text="Cancelling...")
+            self.status_var.set("Cancelling sweep..." + (" (Demo)" if MOCK_MODE else ""))
+
+    def finish_sweep(self, kind, outcome):
+        """Show the worker's result (or error) and re-arm the SWEEP button"""
+        self.sweep_thread = None
+        self.stop_live_plot()
+        self.sweep_button.configure(state='normal', text="SWEEP")
+        self.progress_var.set(0)
+        self.progress_canvas.coords(self.progress_bar, 0, 0, 0, 0)
+        if kind == 'error':
+            messagebox.showerror("Error", f"Sweep failed: {outcome}")
+            self.status_var.set("Sweep failed" + (" (Demo)" if MOCK_MODE else ""))
+            return
 
-            self.update_modern_results_display(rating_result, sweep_time)
-            self.plot_modern_results()
+        sweep_time = time.time() - self.sweep_start_time
+        if self.monitor_rate:
+            sweep_time = 1.0 / self.monitor_rate[1]
+        if not len(outcome):
+            self.status_var.set("Sweep cancelled" + (" (Demo)" if MOCK_MODE else ""))
+            return
+        self.measurements = outcome
+        self.status_var.set("Analyzing results..." + (" (Demo)" if MOCK_MODE else ""))
+        rating_result = self.analyzer.rate_antenna_performance(self.measurements)
 
-            self.status_var.set(f"✅ Sweep completed in {sweep_time:.1f}s - Rating: {rating_result['rating']}"
-                                + (" (Demo)" if MOCK_MODE else ""))
+        self.update_modern_results_display(rating_result, sweep_time)
+        self.plot_modern_results()
 
-        except ValueError as e:
-            messagebox.showerror("Error", f"Invalid input: {e}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Sweep failed: {e}")
-        finally:
-            self.sweep_button.configure(state='normal', text="SWEEP")
-            self.progress_var.set(0)
-            self.progress_canvas.delete("all")
+        if self.monitor_rate:
+            summary = f"Live monitor stopped after {self.monitor_rate[0]} sweeps ({self.monitor_rate[1]:.1f}/s)"
+        elif outcome.truncated:
+            summary = f"Sweep stopped ({outcome.stop_reason}) after {len(outcome)} points"
+        else:
+            summary = f"✅ Sweep completed in {sweep_time:.1f}s"
+        self.status_var.set(f"{summary} - Rating: {rating_result['rating']}" + (" (Demo)" if MOCK_MODE else ""))
 
     def update_modern_results_display(self, rating_result, sweep_time):
         """Update results with pagination system"""
@@ -939,12 +2032,12 @@ class ModernAntennaGUI:
 
         page3 = f"TECHNICAL DETAILS\n"
         page3 += f"{'='*40}\n\n"
-        if self.measurements:
-            frequencies = [m['frequency'] / 1e6 for m in self.measurements]
-            swr_values = [m['swr'] for m in self.measurements]
-            min_swr_idx = swr_values.index(min(swr_values))
+        if len(self.measurements):
+            result = SweepResult.from_measurements(self.measurements)
+            frequencies = result.frequency / 1e6
+            min_swr_idx = result.best_index()
             min_freq = frequencies[min_swr_idx]
-            min_swr = swr_values[min_swr_idx]
+            min_swr = result.swr[min_swr_idx]
             page3 += f"RESONANCE ANALYSIS:\n"
             page3 += f"• Best frequency: {min_freq:.2f} MHz\n"
             page3 += f"• Minimum SWR at resonance: {min_swr:.2f}\n"
@@ -997,33 +2090,18 @@ class ModernAntennaGUI:
         self.view_button.configure(state='normal')
         self.test_button.configure(state='normal')
 
-    def plot_modern_results(self):
-        """Plot results with modern styling optimized for small screen"""
-        if not self.measurements:
-            return
-        frequencies = [m['frequency'] / 1e6 for m in self.measurements]
-        swr_values = [m['swr'] for m in self.measurements]
-
-        self.ax.clear()
+    def style_swr_axes(self):
+        """Background, threshold lines, labels and grid shared by the final and live plots"""
         self.ax.set_facecolor(self.current_theme['bg_muted'])
 
         # Make more prominent
         self.fig.subplots_adjust(top=0.96, bottom=0.12, left=0.08, right=0.995)
 
-        # Line
-        self.ax.plot(frequencies, swr_values, color=self.current_theme['accent'], linewidth=2.8)
         # Threshold lines
         self.ax.axhline(y=1.5, color=self.current_theme['success'], linestyle='--', alpha=0.8, linewidth=1.6)
         self.ax.axhline(y=2.0, color=self.current_theme['warning'], linestyle='--', alpha=0.8, linewidth=1.6)
         self.ax.axhline(y=3.0, color=self.current_theme['error'], linestyle='--', alpha=0.8, linewidth=1.6)
 
-        # Min point
-        try:
-            min_idx = swr_values.index(min(swr_values))
-            self.ax.plot(frequencies[min_idx], swr_values[min_idx], 'o', color=self.current_theme['success'], markersize=9)
-        except Exception:
-            pass
-
         self.ax.set_xlabel('Frequency (MHz)', color=self.current_theme['text_primary'], fontsize=11)
         self.ax.set_ylabel('SWR', color=self.current_theme['text_primary'], fontsize=11)
         title = 'Antenna SWR vs Frequency'
@@ -1031,13 +2109,77 @@ class ModernAntennaGUI:
             title += ' (Demo)'
         self.ax.set_title(title, color=self.current_theme['text_primary'], fontsize=12, fontweight='bold')
         self.ax.grid(True, alpha=0.25, color=self.current_theme['text_muted'], linewidth=0.8)
-        self.ax.set_ylim(1, min(max(swr_values) * 1.1, 10))
         for spine in self.ax.spines.values():
             spine.set_color(self.current_theme['border'])
         self.ax.tick_params(colors=self.current_theme['text_secondary'], labelsize=10)
 
+    def plot_modern_results(self):
+        """Plot results with modern styling optimized for small screen"""
+        if not len(self.measurements):
+            return
+        result = SweepResult.from_measurements(self.measurements)
+        frequencies = result.frequency / 1e6
+        swr_values = result.swr
+
+        self.ax.clear()
+        self.style_swr_axes()
+
+        # Line (mark the measured points when the grid is non-uniform)
+        marker = 'o' if grid_weights(frequencies) is not None else None
+        self.ax.plot(frequencies, swr_values, color=self.current_theme['accent'], linewidth=2.8,
+                     marker=marker, markersize=3)
+
+        # Min point
+        try:
+            min_idx = result.best_index()
+            self.ax.plot(frequencies[min_idx], swr_values[min_idx], 'o', color=self.current_theme['success'], markersize=9)
+        except Exception:
+            pass
+
+        self.ax.set_ylim(1, min(swr_values.max() * 1.1, 10))
         self.canvas.draw_idle()
 
+    def start_live_plot(self, start_freq, stop_freq, points):
+        """Style the axes once and add an empty animated trace that sweeps update by blitting"""
+        self.ax.clear()
+        self.style_swr_axes()
+        self.ax.set_xlim(start_freq / 1e6, stop_freq / 1e6)
+        self.ax.set_ylim(1, 10)
+        self.live_freqs = np.empty(points)
+        self.live_swr = np.empty(points)
+        self.live_count = 0
+        self.live_line, = self.ax.plot([], [], color=self.current_theme['accent'], linewidth=2.8, animated=True)
+        # The full draw fires draw_event, which grabs the static background
+        self.canvas.draw()
+
+    def add_live_point(self, measurement):
+        if self.live_line is not None and self.live_count < len(self.live_swr):
+            self.live_freqs[self.live_count] = measurement['frequency'] / 1e6
+            self.live_swr[self.live_count] = measurement['swr']
+            self.live_count += 1
+
+    def draw_live_plot(self):
+        """Redraw only the trace over the cached background"""
+        if self.live_line is None or self.live_background is None:
+            return
+        self.live_line.set_data(self.live_freqs[:self.live_count], self.live_swr[:self.live_count])
+        self.canvas.restore_region(self.live_background)
+        self.ax.draw_artist(self.live_line)
+        self.canvas.blit(self.ax.bbox)
+
+    def stop_live_plot(self):
+        if self.live_line is not None:
+            self.live_line.remove()
+            self.live_line = None
+            self.live_background = None
+            self.canvas.draw_idle()
+
+    def _on_plot_draw(self, event=None):
+        # Full redraws (first draw, resize) invalidate the blitting background
+        if self.live_line is not None:
+            self.live_background = self.canvas.copy_from_bbox(self.ax.bbox)
+            self.ax.draw_artist(self.live_line)
+
     def on_window_resize(self, event):
         try:
             if self.is_small_screen():
@@ -1062,7 +2204,7 @@ class ModernAntennaGUI:
 
     def save_results(self):
         try:
-            if not self.measurements:
+            if not len(self.measurements):
                 messagebox.showinfo("Save", "No results to save.")
                 return
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -1075,7 +2217,7 @@ class ModernAntennaGUI:
                     'stop_freq': float(self.stop_freq_var.get()),
                     'points': int(self.points_var.get())
                 },
-                'measurements': self.measurements,
+                'measurements': SweepResult.from_measurements(self.measurements).to_dicts(),
                 'rating': {
                     'rating': self.rating_var.get(),
                     'score': int(self.score_var.get().split('/')[0]) if self.score_var.get() != "--" else 0
@@ -1120,6 +2262,8 @@ class ModernAntennaGUI:
             messagebox.showerror("Error", f"View failed: {e}")
 
     def quick_test(self):
+        if self.sweep_thread:
+            return
         try:
             self.start_freq_var.set("10.0")
             self.stop_freq_var.set("20.0")
@@ -1129,6 +2273,8 @@ class ModernAntennaGUI:
             messagebox.showerror("Error", f"Quick test failed: {e}")
 
 if __name__ == '__main__':
+    if tk is None:
+        raise SystemExit("The desktop GUI needs tkinter (python3-tk); use web_analyzer.py instead")
     try:
         root = tk.Tk()
         app = ModernAntennaGUI(root)
@@ -3,7 +3,9 @@ Mock hardware module for Windows development
 Simulates Raspberry Pi GPIO and SPI functionality
 """
 
+import math
 import random
+import threading
 import time
 
 class MockGPIO:
@@ -58,6 +60,7 @@ class SpiDev:
     
     def __init__(self):
         self.max_speed_hz = 1000000
+        self.mode = 0
         self.mock_data = 0
     
     def open(self, bus, device):
@@ -67,6 +70,9 @@ class SpiDev:
         # Simulate ADC reading with some variation
         self.mock_data = (self.mock_data + random.randint(0, 100)) % 1024
         return [1, (self.mock_data >> 8) & 0xFF, self.mock_data & 0xFF]
+    
+    def close(self):
+        print("Mock SPI: Closed")
 
 # Add SpiDev to the module
 MockSpiDevModule.SpiDev = SpiDev
@@ -80,9 +86,30 @@ class MockADS1115:
     P2 = 2
     P3 = 3
     
+    class Mode:
+        """Mock conversion modes (same values as adafruit_ads1x15)"""
+        CONTINUOUS = 0x0000
+        SINGLE = 0x0100
+    
     def __init__(self, i2c):
         print("Mock ADS1115: Initialized I2C ADC")
         self.i2c = i2c
+        self.mode = MockADS1115.Mode.SINGLE
+        self.data_rate = 128
+        self._last_pin_read = None
+    
+    def _read(self, pin):
+        # Model conversion latency the way adafruit_ads1x15 waits for it
+        if self.mode == MockADS1115.Mode.CONTINUOUS and self._last_pin_read == pin:
+            pass  # latest conversion is read back without waiting
+        elif self.mode == MockADS1115.Mode.CONTINUOUS:
+            time.sleep(2 / self.data_rate)  # mux change restarts conversions
+        else:
+            time.sleep(1 / self.data_rate)
+        self._last_pin_read = pin
+        # Return mock voltage reading with some variation
+        base_voltage = 1.5 + random.uniform(-0.5, 0.5)
+        return max(0.0, min(3.3, base_voltage))
     
     class AnalogIn:
         """Mock AnalogIn for ADS1115 channels"""
@@ -93,9 +120,7 @@ class MockADS1115:
         
         @property
         def voltage(self):
-            # Return mock voltage reading with some variation
-            base_voltage = 1.5 + random.uniform(-0.5, 0.5)
-            return max(0.0, min(3.3, base_voltage))
+            return self.ads._read(self.pin)
     
     class board:
         """Mock board for I2C pins"""
@@ -107,4 +132,348 @@ class MockADS1115:
         @staticmethod
         def I2C(scl, sda):
             print(f"Mock I2C: Setup on {scl}/{sda}")
-            return "mock_i2c"
\ No newline at end of file
+            return "mock_i2c"
+
+# Mirror the adafruit_ads1x15.ads1115 module layout (ADS.ADS1115(i2c))
+MockADS1115.ADS1115 = MockADS1115
+
+class BusStats:
+    """Bus activity counted by the instrumented mock backend"""
+    
+    # Nominal Raspberry Pi costs used to estimate bus time (seconds)
+    GPIO_WRITE_TIME = 2e-6
+    I2C_TRANSACTION_TIME = 0.0004   # ~40 bits at 100 kHz
+    SPI_TRANSFER_OVERHEAD = 20e-6   # ioctl round trip
+    
+    def __init__(self, clock=None):
+        self.clock = clock  # VirtualClock to charge the costs to, if any
+        self.reset()
+    
+    def _spend(self, seconds):
+        if self.clock is not None:
+            self.clock.sleep(seconds)
+    
+    def reset(self):
+        self.pin_writes = 0
+        self.pin_toggles = 0
+        self.i2c_transactions = 0
+        self.spi_transfers = 0
+        self.spi_bytes = 0
+        self.conversions = 0
+        self.bus_time = 0.0
+        self.conversion_time = 0.0
+    
+    def gpio_write(self, toggled):
+        self.pin_writes += 1
+        self.pin_toggles += toggled
+        self.bus_time += self.GPIO_WRITE_TIME
+        self._spend(self.GPIO_WRITE_TIME)
+    
+    def i2c(self, transactions):
+        self.i2c_transactions += transactions
+        self.bus_time += transactions * self.I2C_TRANSACTION_TIME
+        self._spend(transactions * self.I2C_TRANSACTION_TIME)
+    
+    def spi(self, nbytes, speed_hz):
+        self.spi_transfers += 1
+        self.spi_bytes += nbytes
+        self.bus_time += self.SPI_TRANSFER_OVERHEAD + nbytes * 8 / speed_hz
+        self._spend(self.SPI_TRANSFER_OVERHEAD + nbytes * 8 / speed_hz)
+    
+    def conversion(self, seconds):
+        self.conversions += 1
+        self.conversion_time += seconds
+        self._spend(seconds)
+    
+    def as_dict(self):
+        return {
+            'pin_writes': self.pin_writes,
+            'pin_toggles': self.pin_toggles,
+            'i2c_transactions': self.i2c_transactions,
+            'spi_transfers': self.spi_transfers,
+            'spi_bytes': self.spi_bytes,
+            'conversions': self.conversions,
+            'bus_time': self.bus_time,
+            'conversion_time': self.conversion_time
+        }
+
+class InstrumentedGPIO:
+    """Silent GPIO mock that counts writes and pin toggles"""
+    BCM = "BCM"
+    OUT = "OUT"
+    LOW = 0
+    HIGH = 1
+    
+    def __init__(self, stats):
+        self.stats = stats
+        self.levels = {}
+    
+    def setmode(self, mode):
+        pass
+    
+    def setup(self, pins, mode):
+        pass
+    
+    def output(self, pins, value):
+        for pin in (pins if isinstance(pins, list) else [pins]):
+            value = int(bool(value))
+            self.stats.gpio_write(self.levels.get(pin) != value)
+            self.levels[pin] = value
+    
+    def cleanup(self):
+        self.levels.clear()
+
+class InstrumentedSpiDev(SpiDev):
+    """Silent SpiDev mock that counts transfers"""
+    
+    def __init__(self, stats):
+        super().__init__()
+        self.stats = stats
+    
+    def open(self, bus, device):
+        pass
+    
+    def xfer2(self, data):
+        self.stats.spi(len(data), self.max_speed_hz)
+        return [0] * len(data)
+    
+    def close(self):
+        pass
+
+class InstrumentedI2C:
+    """I2C bus handle that carries the stats to the ADC mock"""
+    
+    def __init__(self, stats):
+        self.stats = stats
+
+class InstrumentedADS1115(MockADS1115):
+    """Silent ADS1115 mock that accounts for I2C traffic and conversion time"""
+    
+    def __init__(self, i2c):
+        self.i2c = i2c
+        self.stats = i2c.stats
+        self.mode = MockADS1115.Mode.SINGLE
+        self.data_rate = 128
+        self._last_pin_read = None
+        self.clock = self.stats.clock or time
+        self._converting_since = None  # first continuous conversion after the mux write
+        self._held_at = None
+        self._held_value = None
+    
+    def last_conversion_at(self):
+        """Finish time of the latest continuous conversion"""
+        period = 1 / self.data_rate
+        done = (self.clock.time() - self._converting_since) // period
+        return self._converting_since + done * period
+    
+    def _read(self, pin):
+        if (self.mode == MockADS1115.Mode.CONTINUOUS and self._last_pin_read == pin
+                and self._converting_since is not None):
+            self.stats.i2c(1)                       # read conversion register
+            # Only the last finished conversion can be read back
+            done = self.last_conversion_at()
+            if done == self._held_at:
+                return self._held_value
+        elif self.mode == MockADS1115.Mode.CONTINUOUS:
+            self.stats.i2c(2)                       # write config, read result
+            self.stats.conversion(2 / self.data_rate)
+            done = self._converting_since = self.clock.time()
+        else:
+            self.stats.i2c(3)                       # write config, poll, read
+            self.stats.conversion(1 / self.data_rate)
+            done = self.clock.time()
+            self._converting_since = None
+        self._last_pin_read = pin
+        self._held_at = done
+        self._held_value = self._sample(pin, done)
+        return self._held_value
+    
+    def _sample(self, pin, at):
+        base_voltage = 1.5 + random.uniform(-0.5, 0.5)
+        return max(0.0, min(3.3, base_voltage))
+    
+    class AnalogIn(MockADS1115.AnalogIn):
+        """Silent AnalogIn"""
+        def __init__(self, ads, pin):
+            self.ads = ads
+            self.pin = pin
+
+InstrumentedADS1115.ADS1115 = InstrumentedADS1115
+
+class InstrumentedBackend:
+    """Silent mock hardware for benchmarking
+    
+    Stands in for the GPIO/ADS/busio/spidev modules and counts pin toggles,
+    bus transactions and estimated bus time instead of printing.
+    """
+    
+    def __init__(self):
+        self.stats = BusStats()
+        self.GPIO = InstrumentedGPIO(self.stats)
+        self.ADS = InstrumentedADS1115
+        self.AnalogIn = InstrumentedADS1115.AnalogIn
+        self.board = MockADS1115.board
+        self.Mode = MockADS1115.Mode
+        self.busio = self
+        self.spidev = self
+        self.clock = time
+        self.simulates_antenna = True  # the ADC reads noise
+    
+    def I2C(self, scl, sda):
+        return InstrumentedI2C(self.stats)
+    
+    def SpiDev(self):
+        return InstrumentedSpiDev(self.stats)
+
+class VirtualClock:
+    """Simulated time source with the time-module calls the analyzer uses
+    
+    sleep() advances the clock instantly. There is a single timeline, so
+    work done on several threads adds up rather than overlapping.
+    """
+    
+    def __init__(self, start=0.0):
+        self.now = start
+        self._lock = threading.Lock()
+    
+    def sleep(self, seconds):
+        with self._lock:
+            self.now += max(0.0, seconds)
+    
+    def time(self):
+        return self.now
+    
+    perf_counter = monotonic = time
+
+class SimulatedDetector:
+    """AD9850 + detector model: decodes the frames the analyzer loads and
+    settles the magnitude output exponentially after every FQ_UD latch"""
+    
+    DDS_CLOCK_HZ = 125000000.0
+    RESONANT_FREQ = 14.2e6
+    BANDWIDTH = 2.0e6
+    
+    def __init__(self, clock, settle_tau=0.002, noise=0.001):
+        self.clock = clock
+        self.settle_tau = settle_tau
+        self.noise = noise
+        self.register = []
+        self.frequency = 0.0
+        self.latched_at = clock.time()
+        self.start_voltage = self.target_voltage(0.0)
+    
+    def target_voltage(self, freq_hz):
+        # Same dipole shape as the demo antenna, without the random ripple,
+        # through the analyzer's default detector calibration (0.9 V + 0.03 V/dB)
+        offset = abs(freq_hz - self.RESONANT_FREQ) / self.BANDWIDTH
+        swr = min(10.0, 1.1 + 2.0 * offset ** 2)
+        reflection_coeff = (swr - 1) / (swr + 1)
+        voltage = 0.9 + 20 * math.log10(reflection_coeff) * 0.03
+        return max(0.0, min(2.5, voltage))
+    
+    def shift_bit(self, bit):
+        self.register.append(bit)
+        del self.register[:-40]
+    
+    def shift_bytes(self, data):
+        for byte in data:
+            for i in range(7, -1, -1):
+                self.shift_bit((byte >> i) & 1)
+    
+    def latch(self):
+        if len(self.register) < 40:
+            return
+        word = 0
+        for bit in self.register[:32]:
+            word = (word << 1) | bit
+        self.start_voltage = self.magnitude(noise=False)
+        self.frequency = word * self.DDS_CLOCK_HZ / 4294967296.0
+        self.latched_at = self.clock.time()
+    
+    def magnitude(self, noise=True, at=None):
+        """Detector output now, or at an earlier time `at` since the last latch"""
+        target = self.target_voltage(self.frequency)
+        elapsed = max(0.0, (self.clock.time() if at is None else at) - self.latched_at)
+        voltage = target + (self.start_voltage - target) * math.exp(-elapsed / self.settle_tau)
+        if noise:
+            voltage += random.gauss(0.0, self.noise)
+        return voltage
+    
+    def phase(self):
+        return 1.5 + random.gauss(0.0, self.noise)
+
+class SimulatedGPIO(InstrumentedGPIO):
+    """GPIO that charges write cost to the virtual clock and feeds the DDS model"""
+    
+    def __init__(self, stats, detector, w_clk, fq_ud, data):
+        super().__init__(stats)
+        self.detector = detector
+        self.W_CLK = w_clk
+        self.FQ_UD = fq_ud
+        self.DATA = data
+    
+    def output(self, pins, value):
+        for pin in (pins if isinstance(pins, list) else [pins]):
+            rising = value and not self.levels.get(pin)
+            super().output(pin, value)
+            if rising and pin == self.W_CLK:
+                self.detector.shift_bit(self.levels.get(self.DATA, 0))
+            elif rising and pin == self.FQ_UD:
+                self.detector.latch()
+
+class SimulatedSpiDev(InstrumentedSpiDev):
+    """SpiDev whose transfers are shifted into the DDS model"""
+    
+    def __init__(self, stats, detector):
+        super().__init__(stats)
+        self.detector = detector
+    
+    def xfer2(self, data):
+        result = super().xfer2(data)
+        self.detector.shift_bytes(data)
+        return result
+
+class SimulatedI2C(InstrumentedI2C):
+    def __init__(self, stats, detector):
+        super().__init__(stats)
+        self.detector = detector
+
+class SimulatedADS1115(InstrumentedADS1115):
+    """ADS1115 that samples the detector model at the end of each conversion
+    
+    Continuous-mode reads of the same channel return the last finished
+    conversion, so they can predate a retune just like the real part.
+    """
+    
+    def __init__(self, i2c):
+        super().__init__(i2c)
+        self.detector = i2c.detector
+    
+    def _sample(self, pin, at):
+        return self.detector.magnitude(at=at) if pin == 0 else self.detector.phase()
+
+SimulatedADS1115.ADS1115 = SimulatedADS1115
+
+class SimulatedBackend(InstrumentedBackend):
+    """Timing-accurate mock hardware running on a virtual clock
+    
+    GPIO writes, I2C transactions, SPI transfers, ADC conversions and
+    detector settling all advance the clock, and sleeps advance it instead
+    of blocking, so sweeps run in simulated time.
+    """
+    
+    def __init__(self, w_clk=12, fq_ud=16, data=20, settle_tau=0.002):
+        super().__init__()
+        self.clock = VirtualClock()
+        self.stats = BusStats(self.clock)
+        self.detector = SimulatedDetector(self.clock, settle_tau)
+        self.GPIO = SimulatedGPIO(self.stats, self.detector, w_clk, fq_ud, data)
+        self.ADS = SimulatedADS1115
+        self.AnalogIn = SimulatedADS1115.AnalogIn
+        self.simulates_antenna = False  # SWR comes from the detector model
+    
+    def I2C(self, scl, sda):
+        return SimulatedI2C(self.stats, self.detector)
+    
+    def SpiDev(self):
+        return SimulatedSpiDev(self.stats, self.detector)
@@ -1,16 +1,132 @@
 // Antenna Analyzer Web Interface JavaScript
 
+// SWR chart drawn on a <canvas>; points are appended without redrawing the rest
+class SwrChart {
+    constructor(canvas) {
+        this.canvas = canvas;
+        this.ctx = canvas.getContext('2d');
+        this.maxSwr = 10;
+        this.margin = { left: 50, right: 15, top: 15, bottom: 40 };
+        this.lastPoint = null;
+    }
+
+    reset(startFreq, stopFreq) {
+        const ctx = this.ctx;
+        const { width, height } = this.canvas;
+        this.startFreq = startFreq;
+        this.stopFreq = stopFreq;
+        this.lastPoint = null;
+
+        ctx.fillStyle = '#1a1a1a';
+        ctx.fillRect(0, 0, width, height);
+        ctx.fillStyle = '#2a2a2a';
+        ctx.fillRect(this.margin.left, this.margin.top, this.plotWidth(), this.plotHeight());
+
+        ctx.font = '12px sans-serif';
+        ctx.fillStyle = '#cccccc';
+        ctx.strokeStyle = '#444444';
+        ctx.lineWidth = 1;
+        ctx.textAlign = 'right';
+        ctx.textBaseline = 'middle';
+        for (let swr = 1; swr <= this.maxSwr; swr++) {
+            ctx.beginPath();
+            ctx.moveTo(this.margin.left, this.y(swr));
+            ctx.lineTo(width - this.margin.right, this.y(swr));
+            ctx.stroke();
+            ctx.fillText(swr.toString(), this.margin.left - 6, this.y(swr));
+        }
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'top';
+        for (let i = 0; i <= 5; i++) {
+            const freq = startFreq + (stopFreq - startFreq) * i / 5;
+            ctx.fillText((freq / 1e6).toFixed(2), this.x(freq), height - this.margin.bottom + 6);
+        }
+        ctx.fillText('Frequency (MHz)', this.margin.left + this.plotWidth() / 2, height - 16);
+
+        // Threshold lines
+        ctx.setLineDash([6, 4]);
+        [[1.5, '#22c55e'], [2.0, '#f59e0b'], [3.0, '#ef4444']].forEach(([swr, color]) => {
+            ctx.strokeStyle = color;
+            ctx.beginPath();
+            ctx.moveTo(this.margin.left, this.y(swr));
+            ctx.lineTo(width - this.margin.right, this.y(swr));
+            ctx.stroke();
+        });
+        ctx.setLineDash([]);
+    }
+
+    plotWidth() {
+        return this.canvas.width - this.margin.left - this.margin.right;
+    }
+
+    plotHeight() {
+        return this.canvas.height - this.margin.top - this.margin.bottom;
+    }
+
+    x(freq) {
+        return this.margin.left + (freq - this.startFreq) / (this.stopFreq - this.startFreq) * this.plotWidth();
+    }
+
+    y(swr) {
+        const clamped = Math.min(Math.max(swr, 1), this.maxSwr);
+        return this.margin.top + (this.maxSwr - clamped) / (this.maxSwr - 1) * this.plotHeight();
+    }
+
+    // Whole sweep from the compact column arrays the API returns
+    drawSweep(sweep) {
+        const count = sweep.frequency.length;
+        if (count === 0) {
+            return;
+        }
+        this.reset(Math.min(...sweep.frequency), Math.max(...sweep.frequency));
+        this.addPoints(sweep.frequency.map((frequency, i) => ({ frequency, swr: sweep.swr[i] })));
+
+        let best = 0;
+        sweep.swr.forEach((swr, i) => {
+            if (swr < sweep.swr[best]) best = i;
+        });
+        const ctx = this.ctx;
+        const x = this.x(sweep.frequency[best]);
+        const y = this.y(sweep.swr[best]);
+        ctx.fillStyle = '#22c55e';
+        ctx.beginPath();
+        ctx.arc(x, y, 5, 0, 2 * Math.PI);
+        ctx.fill();
+        ctx.textAlign = 'left';
+        ctx.textBaseline = 'bottom';
+        ctx.fillText(`Min: ${sweep.swr[best].toFixed(2)}`, x + 8, y - 4);
+    }
+
+    addPoints(measurements) {
+        if (measurements.length === 0) {
+            return;
+        }
+        const ctx = this.ctx;
+        ctx.strokeStyle = '#3b82f6';
+        ctx.lineWidth = 2;
+        ctx.beginPath();
+        const first = this.lastPoint || measurements[0];
+        ctx.moveTo(this.x(first.frequency), this.y(first.swr));
+        measurements.forEach(m => ctx.lineTo(this.x(m.frequency), this.y(m.swr)));
+        ctx.stroke();
+        this.lastPoint = measurements[measurements.length - 1];
+    }
+}
+
 class AntennaAnalyzer {
     constructor() {
         this.currentResults = null;
         this.history = null;
         this.currentHistoryIndex = 0;
+        this.pollInterval = 500;
+        this.liveChart = null;
         this.init();
     }
 
     init() {
         // Initialize the interface
         console.log('Antenna Analyzer Web Interface initialized');
+        this.liveChart = new SwrChart(document.getElementById('plotCanvas'));
         this.updateNavigationButtons();
     }
 
@@ -24,66 +140,128 @@ class AntennaAnalyzer {
             return;
         }
 
-        // Show loading state
+        await this.runJob('/api/sweep', {
+            start_freq: parseFloat(startFreq),
+            stop_freq: parseFloat(stopFreq),
+            points: parseInt(points)
+        });
+    }
+
+    async quickTest() {
+        const data = await this.runJob('/api/quick-test', {});
+
+        // Update form fields with quick test parameters
+        if (data && data.parameters) {
+            document.getElementById('startFreq').value = data.parameters.start_freq;
+            document.getElementById('stopFreq').value = data.parameters.stop_freq;
+            document.getElementById('points').value = data.parameters.points;
+        }
+    }
+
+    // Sweeps run as server-side jobs: submit, then poll until finished
+    async runJob(url, body) {
         this.showLoading(true);
         
         try {
-            const response = await fetch('/api/sweep', {
+            const response = await fetch(url, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({
-                    start_freq: parseFloat(startFreq),
-                    stop_freq: parseFloat(stopFreq),
-                    points: parseInt(points)
-                })
+                body: JSON.stringify(body)
             });
             
             const data = await response.json();
-            if (data.success) {
-                this.displayResults(data);
-                this.currentResults = data;
-            } else {
+            if (!data.success) {
                 this.showError('Error: ' + data.error);
+                return null;
             }
+
+            const job = window.EventSource
+                ? await this.streamJob(data.job_id)
+                : await this.pollJob(data.job_id);
+            if (job.result) {
+                this.displayResults(job.result);
+                this.currentResults = job.result;
+                return job.result;
+            }
+            this.showError(job.status === 'cancelled' ? 'Test cancelled' : 'Error: ' + job.error);
         } catch (error) {
             this.showError('Network error: ' + error.message);
         } finally {
             this.showLoading(false);
         }
+        return null;
     }
 
-    async quickTest() {
-        this.showLoading(true);
-        
-        try {
-            const response = await fetch('/api/quick-test', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
+    // Points are pushed by the server as they are measured and drawn as they arrive
+    streamJob(jobId) {
+        return new Promise(resolve => {
+            const source = new EventSource(`/api/jobs/${jobId}/stream`);
+            let drawn = 0;
+            source.addEventListener('start', event => {
+                const job = JSON.parse(event.data);
+                // 'start' is sent again after a reconnect; keep what is drawn
+                if (drawn === 0) {
+                    this.showLiveChart(true);
+                    this.liveChart.reset(job.start_freq, job.stop_freq);
                 }
+                this.showJobProgress(job);
             });
-            
-            const data = await response.json();
-            if (data.success) {
-                this.displayResults(data);
-                this.currentResults = data;
-                
-                // Update form fields with quick test parameters
-                if (data.parameters) {
-                    document.getElementById('startFreq').value = data.parameters.start_freq;
-                    document.getElementById('stopFreq').value = data.parameters.stop_freq;
-                    document.getElementById('points').value = data.parameters.points;
+            source.addEventListener('points', event => {
+                const update = JSON.parse(event.data);
+                this.liveChart.addPoints(update.measurements);
+                drawn += update.measurements.length;
+                this.showJobProgress(update);
+            });
+            source.addEventListener('done', event => {
+                source.close();
+                resolve(JSON.parse(event.data));
+            });
+            source.onerror = () => {
+                // EventSource reconnects by itself and resumes after Last-Event-ID;
+                // only a stream it gave up on (e.g. blocked by a proxy) falls back to polling
+                if (source.readyState !== EventSource.CLOSED) {
+                    return;
                 }
-            } else {
-                this.showError('Error: ' + data.error);
+                resolve(this.pollJob(jobId, drawn, drawn > 0));
+            };
+        });
+    }
+
+    showLiveChart(show) {
+        document.getElementById('plotCanvas').style.display = show ? '' : 'none';
+        document.getElementById('plotImage').style.display = show ? 'none' : '';
+    }
+
+    async pollJob(jobId, since = 0, drawing = false) {
+        while (true) {
+            // Only points measured since the last poll are sent back
+            const response = await fetch(`/api/jobs/${jobId}?since=${since}`);
+            const job = await response.json();
+            since = job.next;
+            if (drawing) {
+                this.liveChart.addPoints(job.measurements);
             }
-        } catch (error) {
-            this.showError('Network error: ' + error.message);
-        } finally {
-            this.showLoading(false);
+            if (job.status !== 'queued' && job.status !== 'running') {
+                return job;
+            }
+            this.showJobProgress(job);
+            await new Promise(resolve => setTimeout(resolve, this.pollInterval));
+        }
+    }
+
+    showJobProgress(job) {
+        let text = job.status === 'queued'
+            ? '⏳ Waiting for the analyzer...'
+            : `🔄 Measuring point ${job.progress}/${job.total}`;
+        if (job.eta != null) {
+            text += ` (about ${Math.ceil(job.eta)} s left)`;
+        }
+        if (job.running && job.running.points) {
+            text += ` &mdash; provisional ${job.running.rating}, min SWR ${job.running.min_swr.toFixed(2)}`;
         }
+        document.getElementById('resultsContent').innerHTML = text;
     }
 
     validateInputs(startFreq, stopFreq, points) {
@@ -111,7 +289,6 @@ class AntennaAnalyzer {
 
     displayResults(data) {
         const resultsContent = document.getElementById('resultsContent');
-        const plotImage = document.getElementById('plotImage');
         
         // Display results
         const rating = data.rating;
@@ -127,18 +304,17 @@ class AntennaAnalyzer {
                 <h4 style="color: ${ratingColor}; margin-bottom: 5px;">
                     Rating: ${rating.rating} (${score.toFixed(0)}/100)
                 </h4>
-                <p><strong>Test completed in:</strong> ${data.sweep_time.toFixed(1)} seconds</p>
-                <p><strong>Measurements:</strong> ${data.measurements.length} points</p>
+                ${data.sweep_time != null ? `<p><strong>Test completed in:</strong> ${data.sweep_time.toFixed(1)} seconds</p>` : ''}
+                <p><strong>Measurements:</strong> ${data.sweep.frequency.length} points</p>
             </div>
             <div style="background: #3a3a3a; padding: 10px; border-radius: 4px; font-family: monospace; font-size: 12px;">
                 ${rating.analysis}
             </div>
         `;
         
-        // Display plot
-        if (data.plot_data) {
-            plotImage.src = 'data:image/png;base64,' + data.plot_data;
-        }
+        // Chart is drawn in the browser; PNGs are only rendered on export
+        this.showLiveChart(true);
+        this.liveChart.drawSweep(data.sweep);
         
         this.showSuccess('Test completed successfully!');
     }
@@ -156,7 +332,7 @@ class AntennaAnalyzer {
                     'Content-Type': 'application/json',
                 },
                 body: JSON.stringify({
-                    measurements: this.currentResults.measurements,
+                    sweep: this.currentResults.sweep,
                     rating: this.currentResults.rating,
                     parameters: {
                         start_freq: parseFloat(document.getElementById('startFreq').value),
@@ -177,6 +353,36 @@ class AntennaAnalyzer {
         }
     }
 
+    async exportPlot() {
+        if (!this.currentResults) {
+            this.showError('No results to export. Please run a test first.');
+            return;
+        }
+
+        try {
+            const response = await fetch('/api/export', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ sweep: this.currentResults.sweep })
+            });
+            if (!response.ok) {
+                const data = await response.json();
+                this.showError('Error exporting plot: ' + data.error);
+                return;
+            }
+
+            const link = document.createElement('a');
+            link.href = URL.createObjectURL(await response.blob());
+            link.download = 'antenna_swr.png';
+            link.click();
+            URL.revokeObjectURL(link.href);
+        } catch (error) {
+            this.showError('Error exporting plot: ' + error.message);
+        }
+    }
+
     async showHistory() {
         try {
             const response = await fetch('/api/history');
@@ -272,10 +478,15 @@ class AntennaAnalyzer {
             const response = await fetch(`/api/load/${item.filename}`);
             const data = await response.json();
             
-            if (data.success) {
+            if (data.success && data.sweep) {
                 // Display the loaded results
-                this.displayResults(data);
-                this.currentResults = data;
+                const loaded = {
+                    rating: data.data.rating,
+                    sweep: data.sweep,
+                    sweep_time: data.data.sweep_time
+                };
+                this.displayResults(loaded);
+                this.currentResults = loaded;
                 
                 // Update form fields with loaded parameters
                 if (data.data && data.data.parameters) {
@@ -284,14 +495,9 @@ class AntennaAnalyzer {
                     document.getElementById('points').value = data.data.parameters.points;
                 }
                 
-                // Update plot if available
-                if (data.plot_data) {
-                    document.getElementById('plotImage').src = `data:image/png;base64,${data.plot_data}`;
-                }
-                
                 this.showSuccess('Test results loaded successfully');
             } else {
-                this.showError('Error loading test: ' + data.error);
+                this.showError('Error loading test: ' + (data.error || 'no measurements in file'));
             }
         } catch (error) {
             this.showError('Error loading test: ' + error.message);
@@ -329,6 +535,7 @@ class AntennaAnalyzer {
 
     clearResults() {
         document.getElementById('resultsContent').innerHTML = 'Ready for test results...';
+        this.showLiveChart(false);
         document.getElementById('plotImage').src = 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNjAwIiBoZWlnaHQ9IjQwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjMmEyYTI5Ii8+PHRleHQgeD0iMzAwIiB5PSIyMDAiIGZvbnQtZmFtaWx5PSJBcmlhbCIgZm9udC1zaXplPSIxNCIgZmlsbD0iI2NjY2NjYyIgdGV4dC1hbmNob3I9Im1pZGRsZSI+U1dSIEFuYWx5c2lzIFBsb3Q8L3RleHQ+PC9zdmc+';
         this.currentResults = null;
         
@@ -359,6 +566,10 @@ function saveResults() {
     window.antennaAnalyzer.saveResults();
 }
 
+function exportPlot() {
+    window.antennaAnalyzer.exportPlot();
+}
+
 function showHistory() {
     window.antennaAnalyzer.showHistory();
 }
@@ -1,351 +1,417 @@
-# #!/usr/bin/env python3
-# """
-# Web-based Antenna Analyzer
-# Modern web interface for antenna testing with real-time updates
-# """
-
-# from flask import Flask, render_template, request, jsonify
-# import time
-# import numpy as np
-# import json
-# import os
-# from datetime import datetime
-# import random
-# import io
-# import base64
-# import matplotlib
-# matplotlib.use('Agg')
-# import matplotlib.pyplot as plt
-
-# # Import mock hardware for web development
-# try:
-#     import RPi.GPIO as GPIO
-#     import board
-#     import busio
-#     import adafruit_ads1x15.ads1115 as ADS
-#     from adafruit_ads1x15.analog_in import AnalogIn
-#     MOCK_MODE = False
-# except ImportError:
-#     print("Running in mock mode for web development...")
-#     from mock_hardware import MockGPIO as GPIO, MockADS1115
-#     ADS = MockADS1115
-#     AnalogIn = MockADS1115.AnalogIn
-#     board = MockADS1115.board
-#     busio = MockADS1115.busio
-#     MOCK_MODE = True
-
-# app = Flask(__name__)
-# app.config['SECRET_KEY'] = 'your-secret-key-here'
-
-# class WebAntennaAnalyzer:
-#     def __init__(self):
-#         self.W_CLK = 12
-#         self.FQ_UD = 16
-#         self.DATA = 20
-#         self.RESET = 21
-#         self.ref_voltage = 3.3
-#         self.adc_resolution = 65536  # 16-bit ADS1115
-#         self.ads = None
-#         self.chan0 = None  # Magnitude channel
-#         self.chan1 = None  # Phase channel
-#         self.hardware_ready = False
-#         self.mock_mode = MOCK_MODE
-#         self.setup_hardware()
-    
-#     def setup_hardware(self):
-#         try:
-#             GPIO.setmode(GPIO.BCM)
-#             GPIO.setup([self.W_CLK, self.FQ_UD, self.DATA, self.RESET], GPIO.OUT)
-#             GPIO.output([self.W_CLK, self.FQ_UD, self.DATA], GPIO.LOW)
-#             GPIO.output(self.RESET, GPIO.HIGH)
-            
-#             # Initialize ADS1115 I2C ADC
-#             if not self.mock_mode:
-#                 i2c = busio.I2C(board.SCL, board.SDA)
-#                 self.ads = ADS.ADS1115(i2c)
-#                 self.chan0 = AnalogIn(self.ads, ADS.P0)  # Magnitude
-#                 self.chan1 = AnalogIn(self.ads, ADS.P1)  # Phase
-            
-#             self.reset_dds()
-#             self.hardware_ready = True
-            
-#             if self.mock_mode:
-#                 print("✅ Mock hardware initialized (Web Demo Mode)")
-#             else:
-#                 print("✅ Real hardware initialized (ADS1115 I2C ADC)")
-#         except Exception as e:
-#             print(f"Hardware initialization failed: {e}")
-#             self.hardware_ready = False
-    
-#     def reset_dds(self):
-#         GPIO.output(self.RESET, GPIO.HIGH)
-#         time.sleep(0.001)
-#         GPIO.output(self.RESET, GPIO.LOW)
-#         time.sleep(0.001)
-#         GPIO.output(self.RESET, GPIO.HIGH)
-    
-#     def set_frequency(self, freq_hz):
-#         if not self.hardware_ready:
-#             return False
-#         freq_word = int((freq_hz * 4294967296.0) / 125000000.0)
-#         for i in range(32):
-#             GPIO.output(self.DATA, (freq_word >> (31-i)) & 1)
-#             GPIO.output(self.W_CLK, GPIO.HIGH)
-#             GPIO.output(self.W_CLK, GPIO.LOW)
-#         for i in range(8):
-#             GPIO.output(self.DATA, GPIO.LOW)
-#             GPIO.output(self.W_CLK, GPIO.HIGH)
-#             GPIO.output(self.W_CLK, GPIO.LOW)
-#         GPIO.output(self.FQ_UD, GPIO.HIGH)
-#         GPIO.output(self.FQ_UD, GPIO.LOW)
-#         return True
-    
-#     def read_adc(self, channel):
-#         if not self.hardware_ready:
-#             return 0
-#         try:
-#             if self.mock_mode:
-#                 # Mock ADC reading for demo
-#                 return random.uniform(0.5, 2.5)
-#             else:
-#                 # Read from ADS1115
-#                 if channel == 0:
-#                     return self.chan0.voltage
-#                 elif channel == 1:
-#                     return self.chan1.voltage
-#                 else:
-#                     return 0
-#         except:
-#             return 0
-    
-#     def simulate_antenna_response(self, freq_hz):
-#         resonant_freq = 14.2e6
-#         bandwidth = 2.0e6
-#         freq_offset = abs(freq_hz - resonant_freq)
-#         normalized_offset = freq_offset / bandwidth
-#         base_swr = 1.1 + 2.0 * (normalized_offset ** 2)
-#         harmonic_effect = 0.3 * np.sin(freq_hz / 1e6 * 0.5)
-#         random_variation = random.uniform(-0.1, 0.1)
-#         swr = base_swr + harmonic_effect + random_variation
-#         return max(1.0, min(10.0, swr))
-    
-#     def measure_point(self, freq_hz):
-#         if not self.set_frequency(freq_hz):
-#             return None
-#         time.sleep(0.01)
-#         mag_voltage = self.read_adc(0)
-#         phase_voltage = self.read_adc(1)
-        
-#         if self.mock_mode:
-#             swr = self.simulate_antenna_response(freq_hz)
-#             reflection_coeff = (swr - 1) / (swr + 1)
-#             mag_db = 20 * np.log10(reflection_coeff + 0.01)
-#             mag_voltage = 0.9 + mag_db * 0.03
-#             mag_voltage = max(0.5, min(2.5, mag_voltage))
-#         else:
-#             mag_db = (mag_voltage - 0.9) / 0.03
-#             reflection_coeff = 10 ** (mag_db / 20.0)
-#             reflection_coeff = min(reflection_coeff, 0.99)
-#             if reflection_coeff >= 1.0:
-#                 swr = 999
-#             else:
-#                 swr = (1 + reflection_coeff) / (1 - reflection_coeff)
-#                 swr = min(swr, 50)
-        
-#         return {
-#             'frequency': freq_hz,
-#             'swr': swr,
-#             'mag_voltage': mag_voltage,
-#             'phase_voltage': phase_voltage
-#         }
-    
-#     def frequency_sweep(self, start_freq, stop_freq, points=100):
-#         frequencies = np.linspace(start_freq, stop_freq, points)
-#         measurements = []
-#         for i, freq in enumerate(frequencies):
-#             measurement = self.measure_point(freq)
-#             if measurement:
-#                 measurements.append(measurement)
-#             if i % 10 == 0:
-#                 time.sleep(0.001)
-#         return measurements
-    
-#     def rate_antenna_performance(self, measurements):
-#         if not measurements:
-#             return {"rating": "F", "score": 0, "analysis": "No measurements available"}
-        
-#         swr_values = [m['swr'] for m in measurements]
-#         min_swr = min(swr_values)
-#         avg_swr = np.mean(swr_values)
-#         max_swr = max(swr_values)
-        
-#         excellent_points = sum(1 for swr in swr_values if swr <= 1.5)
-#         good_points = sum(1 for swr in swr_values if swr <= 2.0)
-#         acceptable_points = sum(1 for swr in swr_values if swr <= 3.0)
-        
-#         total_points = len(swr_values)
-#         excellent_ratio = excellent_points / total_points
-#         good_ratio = good_points / total_points
-#         acceptable_ratio = acceptable_points / total_points
-        
-#         score = 0
-#         if excellent_ratio >= 0.8:
-#             score = 90 + (excellent_ratio - 0.8) * 50
-#         elif good_ratio >= 0.6:
-#             score = 70 + (good_ratio - 0.6) * 50
-#         elif acceptable_ratio >= 0.4:
-#             score = 50 + (acceptable_ratio - 0.4) * 50
-#         else:
-#             score = acceptable_ratio * 125
+#!/usr/bin/env python3
+"""
+Web-based Antenna Analyzer
+Modern web interface for antenna testing with real-time updates
+"""
+
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, send_file
+import time
+import json
+import os
+from datetime import datetime
+import io
+import base64
+import threading
+import uuid
+import heapq
+import itertools
+import hashlib
+from collections import OrderedDict
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Hardware access, sweeps and rating are shared with the desktop analyzer
+from analyzer import ModernAntennaAnalyzer, SweepResult, CancelStop, EARLY_STOP_POLICIES, MOCK_MODE
+
+app = Flask(__name__)
+app.config['SECRET_KEY'] = 'your-secret-key-here'
+
+class WebAntennaAnalyzer(ModernAntennaAnalyzer):
+    """Analyzer used by the web server
+
+    Set ANALYZER_MOCK_BACKEND=silent to use the instrumented mock, which
+    counts bus activity instead of printing every pin write.
+    """
+    def __init__(self, mock_backend=None):
+        if mock_backend is None:
+            mock_backend = os.environ.get('ANALYZER_MOCK_BACKEND', 'verbose')
+        super().__init__(mock_backend=mock_backend)
+
+# Global analyzer instance
+analyzer = WebAntennaAnalyzer()
+
+class SweepJob:
+    """A sweep run in the background; clients poll /api/jobs/<id> for progress and results"""
+    def __init__(self, start_freq, stop_freq, points, early_stop=(), parameters=None, options=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.start_freq = start_freq
+        self.stop_freq = stop_freq
+        self.points = points
+        self.early_stop = list(early_stop)
+        self.parameters = parameters
+        self.options = options or {}
+        self.priority = None
+        self.cancel = CancelStop()
+        self.status = 'queued'
+        self.progress = 0
+        self.total = points
+        self.measurements = []
+        self.running = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        # Notified on every new point and when the job ends (for /stream)
+        self.changed = threading.Condition()
+
+    def on_progress(self, current, total):
+        self.progress = current
+        self.total = total
+
+    def on_point(self, measurement, running):
+        with self.changed:
+            self.measurements.append(measurement)
+            self.running = running.as_dict()  # the sweep keeps updating running
+            self.changed.notify_all()
+
+    def finish(self, status):
+        with self.changed:
+            self.status = status
+            self.finished = time.time()
+            self.changed.notify_all()
+
+    def request_cancel(self):
+        self.cancel.cancel()
+        if self.status == 'queued':
+            self.finish('cancelled')
+
+    def run(self):
+        if self.cancel.event.is_set():
+            self.finish('cancelled')
+            return
+        self.status = 'running'
+        try:
+            start_time = time.time()
+            measurements = analyzer.frequency_sweep(self.start_freq, self.stop_freq, self.points,
+                                                    self.on_progress, point_callback=self.on_point,
+                                                    early_stop=[self.cancel] + self.early_stop)
+            sweep_time = time.time() - start_time
             
-#         if min_swr <= 1.2:
-#             score += 5
-#         elif min_swr <= 1.5:
-#             score += 2
-#         if good_ratio >= 0.7:
-#             score += 3
+            rating_result = analyzer.rate_antenna_performance(measurements)
             
-#         score = min(100, max(0, score))
-        
-#         if score >= 90: rating = "A+"
-#         elif score >= 85: rating = "A"
-#         elif score >= 80: rating = "A-"
-#         elif score >= 75: rating = "B+"
-#         elif score >= 70: rating = "B"
-#         elif score >= 65: rating = "B-"
-#         elif score >= 60: rating = "C+"
-#         elif score >= 55: rating = "C"
-#         elif score >= 50: rating = "C-"
-#         elif score >= 40: rating = "D"
-#         else: rating = "F"
-        
-#         analysis = []
-#         analysis.append(f"Minimum SWR: {min_swr:.2f}")
-#         analysis.append(f"Average SWR: {avg_swr:.2f}")
-#         analysis.append(f"Maximum SWR: {max_swr:.2f}")
-#         analysis.append(f"Excellent (≤1.5): {excellent_points}/{total_points} ({excellent_ratio:.1%})")
-#         analysis.append(f"Good (≤2.0): {good_points}/{total_points} ({good_ratio:.1%})")
-#         analysis.append(f"Acceptable (≤3.0): {acceptable_points}/{total_points} ({acceptable_ratio:.1%})")
-        
-#         return {
-#             "rating": rating,
-#             "score": score,
-#             "analysis": "\n".join(analysis),
-#             "stats": {
-#                 "min_swr": min_swr,
-#                 "avg_swr": avg_swr,
-#                 "max_swr": max_swr,
-#                 "excellent_ratio": excellent_ratio,
-#                 "good_ratio": good_ratio,
-#                 "acceptable_ratio": acceptable_ratio
-#             }
-#         }
-    
-#     def cleanup(self):
-#         if self.hardware_ready:
-#             GPIO.cleanup()
-
-# # Global analyzer instance
-# analyzer = WebAntennaAnalyzer()
-
-# @app.route('/')
-# def index():
-#     return render_template('index.html', mock_mode=MOCK_MODE)
-
-# @app.route('/api/sweep', methods=['POST'])
-# def perform_sweep():
-#     try:
-#         data = request.get_json()
-#         start_freq = float(data['start_freq']) * 1e6
-#         stop_freq = float(data['stop_freq']) * 1e6
-#         points = int(data['points'])
-        
-#         if start_freq >= stop_freq:
-#             return jsonify({'error': 'Start frequency must be less than stop frequency'}), 400
-        
-#         if points < 10 or points > 1000:
-#             return jsonify({'error': 'Points must be between 10 and 1000'}), 400
-        
-#         if not analyzer.hardware_ready:
-#             return jsonify({'error': 'Hardware not ready. Check connections.'}), 500
-        
-#         start_time = time.time()
-#         measurements = analyzer.frequency_sweep(start_freq, stop_freq, points)
-#         sweep_time = time.time() - start_time
-        
-#         rating_result = analyzer.rate_antenna_performance(measurements)
-#         plot_data = generate_plot(measurements)
-        
-#         return jsonify({
-#             'success': True,
-#             'measurements': measurements,
-#             'rating': rating_result,
-#             'sweep_time': sweep_time,
-#             'plot_data': plot_data
-#         })
-        
-#     except Exception as e:
-#         return jsonify({'error': str(e)}), 500
-
-# @app.route('/api/quick-test', methods=['POST'])
-# def quick_test():
-#     try:
-#         start_freq = 10.0 * 1e6
-#         stop_freq = 20.0 * 1e6
-#         points = 25
+            self.result = {
+                'success': True,
+                'rating': rating_result,
+                'sweep_time': sweep_time,
+                'truncated': measurements.truncated,
+                'stop_reason': measurements.stop_reason
+            }
+            self.result.update(sweep_payload(measurements, self.options))
+            if self.parameters:
+                self.result['parameters'] = self.parameters
+            self.finish('cancelled' if measurements.stop_reason == 'cancelled' else 'done')
+        except Exception as e:
+            self.error = str(e)
+            self.finish('error')
+
+    def events(self, since=0, keepalive=15.0):
+        """Server-sent events: a 'points' event per batch of new points, then 'done'"""
+        yield sse_event('start', {'job_id': self.id, 'status': self.status, 'eta': scheduler.eta(self),
+                                  'start_freq': self.start_freq, 'stop_freq': self.stop_freq,
+                                  'progress': self.progress, 'total': self.total})
+        sent = since
+        while True:
+            with self.changed:
+                self.changed.wait_for(lambda: len(self.measurements) > sent or self.finished, keepalive)
+                count = len(self.measurements)
+                running = self.running
+                finished = self.finished
+            if count > sent:
+                yield sse_event('points', {
+                    'status': 'running',
+                    'progress': self.progress,
+                    'total': self.total,
+                    'measurements': self.measurements[sent:count],
+                    'running': running
+                }, count)
+                sent = count
+            elif finished:
+                yield sse_event('done', self.as_dict(count), count)
+                return
+            else:
+                yield ': keep-alive\n\n'
+
+    def as_dict(self, since=0):
+        """Job state; measurements are only those after the first `since` points"""
+        count = len(self.measurements)
+        payload = {
+            'success': True,
+            'job_id': self.id,
+            'status': self.status,
+            'start_freq': self.start_freq,
+            'stop_freq': self.stop_freq,
+            'progress': self.progress,
+            'total': self.total,
+            'measurements': self.measurements[since:count],
+            'next': count,
+            'running': self.running
+        }
+        if not self.finished:
+            payload['eta'] = scheduler.eta(self)
+        if self.error:
+            payload['error'] = self.error
+        if self.result:
+            payload['result'] = self.result
+        return payload
+
+# Enough precision for display and re-rating, without 17-digit floats
+COLUMN_DECIMALS = {'frequency': 3, 'swr': 4, 'mag_voltage': 5, 'phase_voltage': 5}
+
+def sweep_payload(measurements, options):
+    """Sweep as compact columns for the browser chart
+
+    The per-point list ('format': 'points') and a server-rendered PNG
+    ('plot': 'png') are only added when asked for.
+    """
+    result = SweepResult.from_measurements(measurements)
+    payload = {'sweep': result.to_columns(COLUMN_DECIMALS)}
+    if options.get('format') == 'points':
+        payload['measurements'] = result.to_dicts()
+    if options.get('plot') == 'png':
+        payload['plot_data'] = generate_plot(result)
+    return payload
+
+def sse_event(name, data, event_id=None):
+    lines = [f'event: {name}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+class QueueFull(Exception):
+    pass
+
+class HardwareScheduler:
+    """Runs sweep jobs on the analyzer one at a time
+
+    Waiting jobs are ordered by priority (lower first) and FIFO within a
+    priority. Beyond max_queued waiting jobs submit() raises QueueFull.
+    ETAs come from a running average of the time per measured point.
+    """
+    QUICK_TEST = 0
+    SWEEP = 1
+
+    def __init__(self, max_queued=8, point_time=0.02):
+        self.max_queued = max_queued
+        self.point_time = point_time
+        self.waiting = []  # heap of (priority, sequence, job)
+        self.sequence = itertools.count()
+        self.current = None
+        self.changed = threading.Condition()
+        self.worker = threading.Thread(target=self.run, name='hardware-scheduler', daemon=True)
+        self.worker.start()
+
+    def submit(self, job, priority):
+        with self.changed:
+            if self.depth() >= self.max_queued:
+                raise QueueFull(f'{self.depth()} sweeps already waiting')
+            job.priority = priority
+            heapq.heappush(self.waiting, (priority, next(self.sequence), job))
+            self.changed.notify()
+
+    def depth(self):
+        return sum(1 for _, _, job in self.waiting if job.status == 'queued')
+
+    def run(self):
+        while True:
+            with self.changed:
+                self.changed.wait_for(lambda: self.waiting)
+                _, _, job = heapq.heappop(self.waiting)
+                self.current = job
+            started = time.time()
+            job.run()
+            if job.measurements:
+                # Exponential average so ETAs follow settle/data-rate changes
+                measured = (time.time() - started) / len(job.measurements)
+                self.point_time = 0.7 * self.point_time + 0.3 * measured
+            with self.changed:
+                self.current = None
+
+    def remaining_time(self, job):
+        return max(0, job.total - job.progress) * self.point_time
+
+    def eta(self, job):
+        """Seconds until job finishes, counting the running job and those ahead of it"""
+        with self.changed:
+            if job is self.current:
+                return self.remaining_time(job)
+            if job.status != 'queued':
+                return None
+            seconds = self.remaining_time(self.current) if self.current else 0.0
+            for _, _, waiting in sorted(self.waiting):
+                if waiting.status == 'queued':
+                    seconds += self.remaining_time(waiting)
+                if waiting is job:
+                    return seconds
+        return None
+
+    def as_dict(self):
+        with self.changed:
+            queued = [job for _, _, job in sorted(self.waiting) if job.status == 'queued']
+            current = self.current
+        return {
+            'depth': len(queued),
+            'max_queued': self.max_queued,
+            'seconds_per_point': self.point_time,
+            'running': {'job_id': current.id, 'eta': self.eta(current)} if current else None,
+            'queued': [{'job_id': job.id, 'priority': job.priority, 'position': position + 1,
+                        'eta': self.eta(job)} for position, job in enumerate(queued)]
+        }
+
+# The one analyzer is only ever driven from the scheduler's worker thread
+scheduler = HardwareScheduler(int(os.environ.get('ANALYZER_MAX_QUEUED', 8)),
+                              analyzer.settle_delay + 2 * analyzer.conversion_time)
+jobs = {}
+jobs_lock = threading.Lock()
+MAX_FINISHED_JOBS = 50
+
+def submit_job(job, priority):
+    try:
+        scheduler.submit(job, priority)
+    except QueueFull as e:
+        # Snapshot the running job once; it may finish while we answer
+        with scheduler.changed:
+            current = scheduler.current
+            retry_after = scheduler.eta(current) if current else 0
+        response = jsonify({'error': f'Analyzer busy: {e}', 'queue': scheduler.as_dict()})
+        response.headers['Retry-After'] = str(int(retry_after or 0) + 1)
+        return response, 429
+    with jobs_lock:
+        finished = [job_id for job_id, old in jobs.items() if old.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS + 1)]:
+            del jobs[job_id]
+        jobs[job.id] = job
+    return jsonify({'success': True, 'job_id': job.id, 'status': job.status,
+                    'eta': scheduler.eta(job)}), 202
+
+@app.route('/')
+def index():
+    return render_template('index.html', mock_mode=MOCK_MODE)
+
+@app.route('/api/sweep', methods=['POST'])
+def perform_sweep():
+    try:
+        data = request.get_json()
+        start_freq = float(data['start_freq']) * 1e6
+        stop_freq = float(data['stop_freq']) * 1e6
+        points = int(data['points'])
         
-#         if not analyzer.hardware_ready:
-#             return jsonify({'error': 'Hardware not ready. Check connections.'}), 500
+        if start_freq >= stop_freq:
+            return jsonify({'error': 'Start frequency must be less than stop frequency'}), 400
         
-#         start_time = time.time()
-#         measurements = analyzer.frequency_sweep(start_freq, stop_freq, points)
-#         sweep_time = time.time() - start_time
+        if points < 10 or points > 1000:
+            return jsonify({'error': 'Points must be between 10 and 1000'}), 400
         
-#         rating_result = analyzer.rate_antenna_performance(measurements)
-#         plot_data = generate_plot(measurements)
+        names = data.get('early_stop', [])
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            return jsonify({'error': 'early_stop must be a list of policy names'}), 400
+        unknown = [name for name in names if name not in EARLY_STOP_POLICIES]
+        if unknown:
+            return jsonify({'error': f"Unknown early-stop policy: {', '.join(unknown)}"}), 400
+        early_stop = [EARLY_STOP_POLICIES[name]() for name in names]
         
-#         return jsonify({
-#             'success': True,
-#             'measurements': measurements,
-#             'rating': rating_result,
-#             'sweep_time': sweep_time,
-#             'plot_data': plot_data,
-#             'parameters': {
-#                 'start_freq': 10.0,
-#                 'stop_freq': 20.0,
-#                 'points': 25
-#             }
-#         })
+        if not analyzer.hardware_ready:
+            return jsonify({'error': 'Hardware not ready. Check connections.'}), 500
         
-#     except Exception as e:
-#         return jsonify({'error': str(e)}), 500
-
-# @app.route('/api/save', methods=['POST'])
-# def save_results():
-#     try:
-#         data = request.get_json()
-#         measurements = data['measurements']
-#         rating = data['rating']
-#         parameters = data['parameters']
+        return submit_job(SweepJob(start_freq, stop_freq, points, early_stop, options=data),
+                          HardwareScheduler.SWEEP)
         
-#         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-#         filename = f"antenna_test_{timestamp}.json"
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/quick-test', methods=['POST'])
+def quick_test():
+    try:
+        start_freq = 10.0 * 1e6
+        stop_freq = 20.0 * 1e6
+        points = 25
         
-#         save_data = {
-#             'timestamp': datetime.now().isoformat(),
-#             'demo_mode': MOCK_MODE,
-#             'parameters': parameters,
-#             'measurements': measurements,
-#             'rating': rating
-#         }
+        if not analyzer.hardware_ready:
+            return jsonify({'error': 'Hardware not ready. Check connections.'}), 500
         
-#         with open(filename, 'w') as f:
-#             json.dump(save_data, f, indent=2)
+        return submit_job(SweepJob(start_freq, stop_freq, points, parameters={
+            'start_freq': 10.0,
+            'stop_freq': 20.0,
+            'points': 25
+        }, options=request.get_json(silent=True)), HardwareScheduler.QUICK_TEST)
         
-#         return jsonify({'success': True, 'filename': filename})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET', 'DELETE'])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    if request.method == 'DELETE':
+        job.request_cancel()
+    return jsonify(job.as_dict(request.args.get('since', 0, type=int)))
+
+@app.route('/api/queue')
+def queue_status():
+    return jsonify({'success': True, 'queue': scheduler.as_dict()})
+
+@app.route('/api/jobs/<job_id>/stream')
+def job_stream(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    # EventSource sends Last-Event-ID when it reconnects; resume after those points
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', 0, type=int)
+    return Response(stream_with_context(job.events(since)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/save', methods=['POST'])
+def save_results():
+    try:
+        data = request.get_json()
+        if 'measurements' in data:
+            measurements = data['measurements']
+        else:
+            measurements = SweepResult.from_measurements(data['sweep']).to_dicts()
+        rating = data['rating']
+        parameters = data['parameters']
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"antenna_test_{timestamp}.json"
+        
+        save_data = {
+            'timestamp': datetime.now().isoformat(),
+            'demo_mode': MOCK_MODE,
+            'parameters': parameters,
+            'measurements': measurements,
+            'rating': rating
+        }
+        
+        with open(filename, 'w') as f:
+            json.dump(save_data, f, indent=2)
+        
+        return jsonify({'success': True, 'filename': filename})
         
-#     except Exception as e:
-#         return jsonify({'error': str(e)}), 500
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/bus-stats', methods=['GET', 'DELETE'])
+def bus_stats():
+    stats = analyzer.bus_stats
+    if stats is None:
+        return jsonify({'error': 'Bus statistics need ANALYZER_MOCK_BACKEND=silent'}), 404
+    if request.method == 'DELETE':
+        stats.reset()
+    return jsonify({'success': True, 'stats': stats.as_dict()})
 
 @app.route('/api/history')
 def get_history():
@@ -378,17 +444,24 @@ def get_history():
 @app.route('/api/load/<filename>')
 def load_results(filename):
     try:
-        with open(filename, 'r') as f:
-            data = json.load(f)
+        with open(filename, 'rb') as f:
+            raw = f.read()
         
-        measurements = data.get('measurements', [])
-        plot_data = generate_plot(measurements) if measurements else None
+        # Same file and options -> same response; let the browser revalidate cheaply
+        etag = hashlib.sha256(raw + request.query_string).hexdigest()
+        if request.if_none_match.contains(etag):
+            return not_modified(etag)
         
-        return jsonify({
-            'success': True,
-            'data': data,
-            'plot_data': plot_data
-        })
+        data = json.loads(raw)
+        measurements = data.pop('measurements', [])
+        payload = {'success': True, 'data': data}
+        if measurements:
+            payload.update(sweep_payload(measurements, request.args))
+        
+        response = jsonify(payload)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -402,16 +475,163 @@ def delete_results(filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/export', methods=['POST'])
+def export_plot():
+    try:
+        data = request.get_json()
+        measurements = data.get('sweep') or data.get('measurements')
+        if not measurements or not len(SweepResult.from_measurements(measurements)):
+            return jsonify({'error': 'No measurements to export'}), 400
+        return png_response(measurements, 'antenna_swr.png')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/export/<filename>')
+def export_saved_plot(filename):
+    try:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        
+        measurements = data.get('measurements', [])
+        if not measurements:
+            return jsonify({'error': 'No measurements to export'}), 404
+        return png_response(measurements, os.path.splitext(filename)[0] + '.png')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/plot-cache', methods=['GET', 'DELETE'])
+def plot_cache_stats():
+    if request.method == 'DELETE':
+        plot_cache.clear()
+    return jsonify({'success': True, 'stats': plot_cache.as_dict()})
+
+class PlotCache:
+    """Rendered PNGs keyed by a hash of the plotted arrays and render options
+
+    The newest max_entries stay in memory (least recently used go first).
+    With a directory, PNGs are also kept on disk and survive restarts.
+    """
+    def __init__(self, max_entries=32, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(result, options):
+        digest = hashlib.sha256()
+        digest.update(result.frequency.tobytes())
+        digest.update(result.swr.tobytes())
+        digest.update(json.dumps(options, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.png')
+
+    def get(self, key):
+        with self.lock:
+            png = self.entries.get(key)
+            if png is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return png
+        if self.directory and os.path.exists(self.path(key)):
+            with open(self.path(key), 'rb') as f:
+                png = f.read()
+            self.disk_hits += 1
+            self.remember(key, png)
+            return png
+        return None
+
+    def remember(self, key, png):
+        with self.lock:
+            self.entries[key] = png
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def put(self, key, png):
+        self.remember(key, png)
+        if self.directory:
+            # Write then rename so readers never see a partial file
+            temp = self.path(key) + f'.{threading.get_ident()}.tmp'
+            with open(temp, 'wb') as f:
+                f.write(png)
+            os.replace(temp, self.path(key))
+
+    def render(self, result, options):
+        """(key, png) for the sweep, rendering only on a cache miss"""
+        key = self.key(result, options)
+        png = self.get(key)
+        if png is None:
+            with self.lock:
+                self.misses += 1
+            png = render_plot(result, options)
+            self.put(key, png)
+        return key, png
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'bytes': sum(len(png) for png in self.entries.values()),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'directory': self.directory
+            }
+
+# Everything that changes the rendered image belongs in the cache key
+PLOT_OPTIONS = {'theme': 'dark', 'figsize': [10, 6], 'dpi': 100, 'demo': MOCK_MODE}
+plot_cache = PlotCache(int(os.environ.get('ANALYZER_PLOT_CACHE_SIZE', 32)),
+                       os.environ.get('ANALYZER_PLOT_CACHE_DIR'))
+
+def not_modified(etag):
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def png_response(measurements, download_name):
+    """PNG download with an ETag; a matching If-None-Match skips rendering entirely"""
+    result = SweepResult.from_measurements(measurements)
+    key = plot_cache.key(result, PLOT_OPTIONS)
+    if request.if_none_match.contains(key):
+        return not_modified(key)
+    key, png = plot_cache.render(result, PLOT_OPTIONS)
+    response = send_file(io.BytesIO(png), mimetype='image/png', as_attachment=True, download_name=download_name)
+    response.set_etag(key)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 def generate_plot(measurements):
-    if not measurements:
+    """Base64 PNG of the SWR plot, or None without measurements"""
+    if not len(measurements):
         return None
+    _, png = plot_cache.render(SweepResult.from_measurements(measurements), PLOT_OPTIONS)
+    return base64.b64encode(png).decode()
+
+def render_plot(measurements, options=PLOT_OPTIONS):
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=tuple(options['figsize']))
     fig.patch.set_facecolor('#1a1a1a')
     ax.set_facecolor('#2a2a2a')
     
-    frequencies = [m['frequency'] / 1e6 for m in measurements]
-    swr_values = [m['swr'] for m in measurements]
+    result = SweepResult.from_measurements(measurements)
+    frequencies = result.frequency / 1e6
+    swr_values = result.swr
     
     ax.plot(frequencies, swr_values, color='#3b82f6', linewidth=2, label='SWR', alpha=0.9)
     
@@ -419,7 +639,7 @@ def generate_plot(measurements):
     ax.axhline(y=2.0, color='#f59e0b', linestyle='--', alpha=0.7, linewidth=1.5, label='2.0')
     ax.axhline(y=3.0, color='#ef4444', linestyle='--', alpha=0.7, linewidth=1.5, label='3.0')
     
-    min_swr_idx = np.argmin(swr_values)
+    min_swr_idx = result.best_index()
     ax.plot(frequencies[min_swr_idx], swr_values[min_swr_idx], 
             'o', color='#22c55e', markersize=10, 
             label=f'Min: {swr_values[min_swr_idx]:.2f}')
@@ -427,7 +647,7 @@ def generate_plot(measurements):
     ax.set_xlabel('Frequency (MHz)', color='#ffffff', fontsize=12)
     ax.set_ylabel('SWR', color='#ffffff', fontsize=12)
     title = 'Antenna SWR vs Frequency'
-    if MOCK_MODE:
+    if options['demo']:
         title += ' (Demo)'
     ax.set_title(title, color='#ffffff', fontsize=14, fontweight='bold')
     
@@ -435,20 +655,18 @@ def generate_plot(measurements):
     ax.legend(facecolor='#1a1a1a', edgecolor='#444444',
               labelcolor='#ffffff', fontsize=10, loc='upper right')
     
-    ax.set_ylim(1, min(max(swr_values) * 1.1, 10))
+    ax.set_ylim(1, min(swr_values.max() * 1.1, 10))
     
     for spine in ax.spines.values():
         spine.set_color('#444444')
     ax.tick_params(colors='#cccccc', labelsize=10)
     
     img_buffer = io.BytesIO()
-    fig.savefig(img_buffer, format='png', dpi=100, bbox_inches='tight', 
+    fig.savefig(img_buffer, format='png', dpi=options['dpi'], bbox_inches='tight', 
                 facecolor='#1a1a1a', edgecolor='none')
-    img_buffer.seek(0)
-    img_data = base64.b64encode(img_buffer.getvalue()).decode()
     plt.close(fig)
     
-    return img_data
+    return img_buffer.getvalue()
 
 if __name__ == '__main__':
     print("Starting Web Antenna Analyzer...")